@@ -0,0 +1,142 @@
+"""Prueba de carga de ``api.py``: consultas por segundo y latencias.
+
+Levanta la API con uvicorn en un subproceso y la golpea con
+``--conexiones`` clientes HTTP/1.1 keep-alive concurrentes (asyncio, sin
+dependencias) durante ``--segundos`` en tres escenarios:
+
+- ``frio``: cada consulta es distinta (series y meses al azar), así que
+  casi todas se calculan;
+- ``caliente``: un conjunto chico de consultas repetidas, servidas desde
+  la caché de respuestas;
+- ``etag``: las mismas con ``If-None-Match``, contestadas con 304.
+
+    python benchmarks/bench_api.py --segundos 10 --conexiones 32 --workers 1
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from urllib.parse import urlencode
+
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from ipc.almacen import obtener_datos  # noqa: E402
+from ipc.series import metadatos_serie  # noqa: E402
+
+
+def armar_consultas(n, semilla=0):
+    """``n`` rutas con consultas válidas de acumulada, actualización y serie."""
+    _, indice, tablas, _ = obtener_datos()
+    fechas = {k: metadatos_serie(tablas["indice"], k) for k in indice["series"] if k[0] == "variaciones"}
+    claves = [k for k, meta in fechas.items() if len(meta["fechas"]) > 1]
+    rng = random.Random(semilla)
+    rutas = []
+    for _ in range(n):
+        origen, region, categoria = rng.choice(claves)
+        desde, hasta = sorted(rng.sample(fechas[(origen, region, categoria)]["fechas"], 2))
+        params = {"region": region, "categoria": categoria, "desde": desde, "hasta": hasta}
+        ruta = rng.choice(["/acumulada", "/actualizar", "/serie"])
+        if ruta == "/actualizar":
+            params["monto"] = rng.randint(1, 10**6)
+        rutas.append(f"{ruta}?{urlencode(params)}")
+    return rutas
+
+
+async def cliente(host, puerto, rutas, hasta, con_etag, latencias, estados):
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    etags = {}
+    i = 0
+    while time.perf_counter() < hasta:
+        ruta = rutas[i % len(rutas)]
+        i += 1
+        extra = f"If-None-Match: {etags[ruta]}\r\n" if con_etag and ruta in etags else ""
+        t0 = time.perf_counter()
+        escritor.write(f"GET {ruta} HTTP/1.1\r\nHost: {host}\r\n{extra}\r\n".encode())
+        await escritor.drain()
+
+        encabezados = (await lector.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        estado = int(encabezados[0].split()[1])
+        campos = dict(l.split(": ", 1) for l in encabezados[1:] if ": " in l)
+        largo = int(campos.get("content-length", 0))
+        if largo:
+            await lector.readexactly(largo)
+        latencias.append(time.perf_counter() - t0)
+        estados[estado] = estados.get(estado, 0) + 1
+        if "etag" in campos:
+            etags[ruta] = campos["etag"]
+    escritor.close()
+
+
+async def escenario(host, puerto, rutas, segundos, conexiones, con_etag=False):
+    latencias, estados = [], {}
+    hasta = time.perf_counter() + segundos
+    t0 = time.perf_counter()
+    await asyncio.gather(*[
+        cliente(host, puerto, rutas[i::conexiones] or rutas, hasta, con_etag, latencias, estados)
+        for i in range(conexiones)
+    ])
+    duracion = time.perf_counter() - t0
+    lat = np.array(latencias) * 1000
+    return {
+        "consultas_por_segundo": len(lat) / duracion,
+        "p50_ms": float(np.percentile(lat, 50)),
+        "p99_ms": float(np.percentile(lat, 99)),
+        "estados": estados,
+    }
+
+
+async def esperar_api(host, puerto, timeout=120):
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        try:
+            _, escritor = await asyncio.open_connection(host, puerto)
+            escritor.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError("La API no respondió a tiempo")
+
+
+async def correr(args):
+    await esperar_api(args.host, args.puerto)
+    escenarios = [
+        ("frio", armar_consultas(200_000, semilla=1), False),
+        ("caliente", armar_consultas(200, semilla=2), False),
+        ("etag", armar_consultas(200, semilla=2), True),
+    ]
+    print(f"{args.conexiones} conexiones, {args.workers} worker(s), {args.segundos} s por escenario")
+    print(f"{'escenario':<12}{'consultas/s':>14}{'p50 ms':>10}{'p99 ms':>10}  estados")
+    for nombre, rutas, con_etag in escenarios:
+        r = await escenario(args.host, args.puerto, rutas, args.segundos, args.conexiones, con_etag)
+        print(f"{nombre:<12}{r['consultas_por_segundo']:>14.0f}{r['p50_ms']:>10.2f}{r['p99_ms']:>10.2f}  {r['estados']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--segundos", type=float, default=10)
+    parser.add_argument("--conexiones", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    servidor = subprocess.Popen(
+        [sys.executable, "-m", "ipc.api", "--host", args.host,
+         "--puerto", str(args.puerto), "--workers", str(args.workers)],
+        cwd=RAIZ,
+    )
+    try:
+        asyncio.run(correr(args))
+    finally:
+        servidor.terminate()
+        servidor.wait()
+
+
+if __name__ == "__main__":
+    main()
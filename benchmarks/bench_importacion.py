@@ -0,0 +1,81 @@
+"""Tiempo de importación de cada punto de entrada, en un intérprete nuevo por corrida.
+
+Para cada módulo mide el mejor de ``--repeticiones`` de ``import`` (sin
+cargar datos) e indica qué dependencias pesadas quedaron importadas.
+Los módulos de datos, agregación y la API no deben importar plotly ni
+Streamlit: si alguno lo hace el proceso termina con código 1.
+
+    python benchmarks/bench_importacion.py
+    python benchmarks/bench_importacion.py --raiz /ruta/a/otra/copia
+
+Con ``--raiz`` se mide otra copia del repo; si no tiene el paquete
+``ipc`` se importan los módulos sueltos de su raíz (la disposición
+anterior), para comparar.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulo -> si puede importar plotly o Streamlit.
+MODULOS = {
+    "datos": False,
+    "calidad": False,
+    "ingesta": False,
+    "almacen": False,
+    "api": False,
+    "exportar": False,
+    "graficos": True,
+    "reportes_lote": True,
+    "app": True,
+}
+PESADAS = ["numpy", "pandas", "pyarrow", "plotly", "streamlit"]
+
+CODIGO = """
+import json, sys, time
+t0 = time.perf_counter()
+__import__(sys.argv[1])
+segundos = time.perf_counter() - t0
+print(json.dumps({"segundos": segundos, "pesadas": [m for m in sys.argv[2:] if m in sys.modules]}))
+"""
+
+
+def medir(raiz, modulo, repeticiones):
+    """Mejor tiempo (s) de importar ``modulo`` en ``raiz`` y las dependencias pesadas que cargó."""
+    corridas = []
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, "-c", CODIGO, modulo, *PESADAS], cwd=raiz,
+                                capture_output=True, text=True, check=True)
+        corridas.append(json.loads(salida.stdout.strip().splitlines()[-1]))
+    return min(c["segundos"] for c in corridas), corridas[-1]["pesadas"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--raiz", default=RAIZ)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    paquete = os.path.isdir(os.path.join(args.raiz, "ipc"))
+    print(f"{os.path.abspath(args.raiz)}, mejor de {args.repeticiones} (ms)")
+    print(f"{'módulo':<22}{'ms':>8}  importa")
+    fallas = []
+    for modulo, presentacion in MODULOS.items():
+        nombre = f"ipc.{modulo}" if paquete else modulo
+        if not paquete and not os.path.exists(os.path.join(args.raiz, f"{modulo}.py")):
+            continue
+        segundos, pesadas = medir(args.raiz, nombre, args.repeticiones)
+        print(f"{nombre:<22}{segundos * 1000:>8.1f}  {', '.join(pesadas)}")
+        if not presentacion and {"plotly", "streamlit"} & set(pesadas):
+            fallas.append(nombre)
+
+    if fallas:
+        print(f"\nImportan plotly o Streamlit fuera de la presentación: {', '.join(fallas)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
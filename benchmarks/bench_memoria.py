@@ -0,0 +1,39 @@
+"""Huella de memoria del maestro con y sin el esquema compacto de tipos.
+
+Reporta, por columna, los bytes en memoria del frame tal como sale del
+CSV (con "Región Nacional") y después de ``aplicar_esquema``, más el
+tamaño serializado que ``st.cache_data`` copia a cada sesión.
+
+    python benchmarks/bench_memoria.py
+"""
+import os
+import pickle
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from ipc.agregacion import agregar_nacional  # noqa: E402
+from ipc.datos import aplicar_esquema, leer_maestro, memoria  # noqa: E402
+
+
+def main():
+    original = agregar_nacional(leer_maestro())
+    compacto = aplicar_esquema(original)
+
+    cols_orig, total_orig = memoria(original)
+    cols_comp, total_comp = memoria(compacto)
+
+    print(f"{'columna':<24}{'tipo':>16}{'original (MB)':>16}{'compacto (MB)':>16}")
+    for col in original.columns:
+        print(f"{col:<24}{str(compacto[col].dtype):>16}"
+              f"{cols_orig[col] / 1e6:>16.3f}{cols_comp[col] / 1e6:>16.3f}")
+    print(f"{'total':<24}{'':>16}{total_orig / 1e6:>16.3f}{total_comp / 1e6:>16.3f}")
+
+    pickle_orig = len(pickle.dumps(original, protocol=pickle.HIGHEST_PROTOCOL))
+    pickle_comp = len(pickle.dumps(compacto, protocol=pickle.HIGHEST_PROTOCOL))
+    print(f"{'pickle (cache_data)':<24}{'':>16}{pickle_orig / 1e6:>16.3f}{pickle_comp / 1e6:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark de carga en frío: cálculo de "Región Nacional" antes y después.
+
+Compara el camino original (``groupby().apply(calc_nacional)``) con el
+motor vectorizado de ``agregacion`` sobre el CSV del repo y sobre una
+versión sintética escalada (categorías replicadas ``--escala`` veces).
+
+    python benchmarks/bench_nacional.py --escala 100
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from ipc.agregacion import agregar_nacional, normalizar_pesos  # noqa: E402
+from ipc.datos import CSV_MAESTRO, leer_maestro  # noqa: E402
+from ipc.ponderaciones import pesos_regionales  # noqa: E402
+
+
+def carga_original(ruta):
+    df = leer_maestro(ruta)
+    pesos = normalizar_pesos(pesos_regionales())
+    base = df[df["region"].isin(pesos.keys())].copy()
+
+    def calc_nacional(g):
+        return sum(g["indice"] * g["region"].map(pesos))
+
+    ipc_nacional = (
+        base.groupby(["fecha", "categoria", "origen"])
+        .apply(calc_nacional)
+        .reset_index(name="indice")
+    )
+    ipc_nacional = ipc_nacional.sort_values("fecha")
+    ipc_nacional["variacion_mensual"] = ipc_nacional.groupby(["categoria", "origen"])["indice"].pct_change() * 100
+    ipc_nacional["variacion_interanual"] = ipc_nacional.groupby(["categoria", "origen"])["indice"].pct_change(12) * 100
+    ipc_nacional["region"] = "Región Nacional"
+    return pd.concat([df, ipc_nacional], ignore_index=True)
+
+
+def carga_vectorizada(ruta):
+    return agregar_nacional(leer_maestro(ruta), pesos_regionales())
+
+
+def generar_sintetico(ruta_destino, escala):
+    df = pd.read_csv(CSV_MAESTRO)
+    copias = []
+    for i in range(escala):
+        copia = df.copy()
+        copia["categoria"] = copia["categoria"] + f" #{i}"
+        copias.append(copia)
+    pd.concat(copias, ignore_index=True).to_csv(ruta_destino, index=False)
+
+
+def medir(funcion, ruta, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        resultado = funcion(ruta)
+        tiempos.append(time.perf_counter() - t0)
+    return min(tiempos), len(resultado)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escala", type=int, default=100)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--sin-original", action="store_true",
+                        help="No medir el camino original sobre el dataset sintético (tarda minutos).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sintetico = os.path.join(tmp, f"ipc_x{args.escala}.csv")
+        generar_sintetico(sintetico, args.escala)
+
+        casos = [("repo", CSV_MAESTRO, args.repeticiones), (f"x{args.escala}", sintetico, 1)]
+        print(f"{'dataset':<10}{'filas':>12}{'original (s)':>15}{'vectorizado (s)':>18}{'speedup':>10}")
+        for nombre, ruta, reps in casos:
+            t_vec, filas = medir(carga_vectorizada, ruta, reps)
+            if nombre != "repo" and args.sin_original:
+                print(f"{nombre:<10}{filas:>12}{'-':>15}{t_vec:>18.3f}{'-':>10}")
+                continue
+            t_orig, _ = medir(carga_original, ruta, reps)
+            print(f"{nombre:<10}{filas:>12}{t_orig:>15.3f}{t_vec:>18.3f}{t_orig / t_vec:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Tiempo hasta el primer gráfico: carga de todos los orígenes frente a carga por origen.
+
+Mide, en un proceso nuevo por corrida (con los módulos ya importados),
+lo que la vista por defecto espera antes de poder graficar "Nivel
+general" de "Región Nacional" (variaciones):
+
+- ``completo``: como antes, ``preparar_datos()`` con todos los orígenes,
+  las tablas de todos los indicadores y el cubo de precios;
+- ``por_origen``: la lista de orígenes, ``preparar_datos`` sólo de
+  variaciones (lo que hace ``datos_origen`` en la app).
+
+En los dos casos se suman los metadatos de fechas de la serie elegida y
+el armado de la figura. Cada modo corre con la caché en disco vacía
+(``fria``: hay que leer el CSV) y ya escrita (``caliente``).
+
+Con ``--app`` además corre el script de Streamlit con su harness de
+testing en un proceso aparte: primera ejecución y "▶ Ejecutar" con los
+filtros por defecto. ``--script`` permite medir otra copia de la app
+(p. ej. la versión anterior) con el mismo procedimiento.
+
+    python benchmarks/bench_primer_grafico.py --escala 10 --app
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from bench_nacional import generar_sintetico  # noqa: E402
+from ipc.almacen import preparar_datos  # noqa: E402
+from ipc.datos import CSV_MAESTRO, obtener_serie, origenes_maestro  # noqa: E402
+from ipc.graficos import figura_serie_temporal  # noqa: E402
+from ipc.series import datos_serie_temporal, metadatos_serie  # noqa: E402
+
+# Se ejecuta con ``python -c`` para no importar los módulos de este árbol
+# antes que los del script medido.
+CODIGO_APP = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+t0 = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=300).run()
+t1 = time.perf_counter()
+at.sidebar.button[0].click().run()
+t2 = time.perf_counter()
+assert not at.exception and len(at.get("plotly_chart")) == 1, at.exception
+print(json.dumps({"primera_ejecucion": t1 - t0, "primer_grafico": t2 - t0}))
+"""
+
+
+def vista_por_defecto(df, indice, tablas):
+    """Figura de la vista por defecto a partir de los datos cargados."""
+    categoria = next(c for c in indice["categorias"][("variaciones", "Región Nacional")] if c.startswith("Nivel general"))
+    clave = ("variaciones", "Región Nacional", categoria)
+    meses = metadatos_serie(tablas["indice"], clave)["fechas"]
+    base = obtener_serie(df, indice, *clave).dropna(subset=["indice"])
+    datos = datos_serie_temporal(base, "indice", meses[0], meses[-1])
+    return figura_serie_temporal(datos, "indice", categoria, clave[1], clave[0])
+
+
+def corrida(modo, ruta, cola):
+    t0 = time.perf_counter()
+    if modo == "completo":
+        df, indice, tablas, _ = preparar_datos(ruta)
+    else:
+        origenes_maestro(ruta)
+        df, indice, tablas, _ = preparar_datos(ruta, origen="variaciones")
+    vista_por_defecto(df, indice, tablas)
+    cola.put(time.perf_counter() - t0)
+
+
+def medir(modo, ruta, dir_cache):
+    os.environ["IPC_CACHE_DIR"] = dir_cache
+    ctx = mp.get_context("spawn")
+    cola = ctx.Queue()
+    proceso = ctx.Process(target=corrida, args=(modo, ruta, cola))
+    proceso.start()
+    segundos = cola.get()
+    proceso.join()
+    return segundos
+
+
+def medir_app(script, dir_cache):
+    entorno = {**os.environ, "IPC_CACHE_DIR": dir_cache}
+    salida = subprocess.run([sys.executable, "-c", CODIGO_APP, script], env=entorno,
+                            capture_output=True, text=True, check=True)
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escala", type=int, default=1)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--app", action="store_true", help="Medir también el script de Streamlit (datos del repo).")
+    parser.add_argument("--script", default=os.path.join(RAIZ, "reportes_ipc_plotly.py"))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = CSV_MAESTRO
+        if args.escala != 1:
+            ruta = os.path.join(tmp, f"ipc_x{args.escala}.csv")
+            generar_sintetico(ruta, args.escala)
+
+        print(f"escala x{args.escala}, mejor de {args.repeticiones} (ms)")
+        print(f"{'modo':<12}{'caché fría':>12}{'caché caliente':>16}")
+        for modo in ("completo", "por_origen"):
+            frias, calientes = [], []
+            for i in range(args.repeticiones):
+                dir_cache = os.path.join(tmp, f"cache_{modo}_{i}")
+                frias.append(medir(modo, ruta, dir_cache))
+                calientes.append(medir(modo, ruta, dir_cache))
+            print(f"{modo:<12}{min(frias) * 1000:>12.1f}{min(calientes) * 1000:>16.1f}")
+
+        if args.app:
+            dir_cache = os.path.join(tmp, "cache_app")
+            medir_app(args.script, dir_cache)
+            tiempos = [medir_app(args.script, dir_cache) for _ in range(args.repeticiones)]
+            print(f"\napp ({os.path.relpath(args.script)}), caché en disco caliente (ms)")
+            for etapa in ("primera_ejecucion", "primer_grafico"):
+                print(f"{etapa:<20}{min(t[etapa] for t in tiempos) * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Tamaño del payload y tiempo de render de figuras grandes, con y sin render liviano.
+
+Arma las figuras más pesadas de la app (todas las series superpuestas y
+la serie mensual completa con rótulos) tal cual y pasadas por
+``graficos.aligerar_figura`` (LTTB, rótulos raleados y WebGL), y mide:
+
+- tiempo de armado y serialización a JSON en el servidor;
+- bytes del JSON que viaja al navegador;
+- con ``--navegador``, el tiempo de ``Plotly.newPlot`` en un Chromium
+  headless (requiere el paquete ``playwright`` y su navegador).
+
+Con ``--html DIR`` además escribe cada figura como HTML autocontenido
+que muestra en el título el tiempo de render, para medir a mano.
+
+    python benchmarks/bench_render.py --escala 10 --navegador
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import plotly.io as pio
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from bench_nacional import generar_sintetico  # noqa: E402
+from ipc.agregacion import agregar_nacional  # noqa: E402
+from ipc.consultas import construir_tabla, series_alineadas  # noqa: E402
+from ipc.datos import CSV_MAESTRO, aplicar_esquema, indexar_series, leer_maestro, obtener_serie  # noqa: E402
+from ipc.graficos import aligerar_figura, figura_comparacion, figura_serie_temporal  # noqa: E402
+
+# Envuelve la figura para medir en el navegador cuánto tarda Plotly.newPlot.
+PLANTILLA_HTML = """<html><head><script src="https://cdn.plot.ly/plotly-2.35.2.min.js"></script></head>
+<body><div id="fig"></div><script>
+const fig = {json};
+const t0 = performance.now();
+Plotly.newPlot("fig", fig.data, fig.layout).then(() => {{
+  window.renderMs = performance.now() - t0;
+  document.title = "render " + window.renderMs.toFixed(1) + " ms";
+}});
+</script></body></html>"""
+
+
+def figuras(ruta):
+    """Figuras pesadas de la app armadas sobre el CSV ``ruta``."""
+    df, indice = indexar_series(aplicar_esquema(agregar_nacional(leer_maestro(ruta))))
+    tabla = construir_tabla(df, indice)
+    claves = [k for k in indice["series"] if k[0] == "variaciones"]
+    base = obtener_serie(df, indice, *claves[0]).dropna(subset=["variacion_mensual"])
+    return {
+        f"comparacion_{len(claves)}_series": lambda: figura_comparacion(
+            series_alineadas(tabla, claves, "1900-01", "2100-01", True), "indice", True
+        ),
+        "serie_mensual_rotulada": lambda: figura_serie_temporal(
+            base, "variacion_mensual", claves[0][2], claves[0][1], claves[0][0]
+        ),
+    }
+
+
+def render_navegador(paginas):
+    """Tiempo de ``Plotly.newPlot`` (ms) de cada página HTML en Chromium headless."""
+    from playwright.sync_api import sync_playwright
+
+    tiempos = {}
+    with sync_playwright() as p:
+        navegador = p.chromium.launch()
+        pagina = navegador.new_page()
+        for nombre, ruta in paginas.items():
+            pagina.goto(f"file://{ruta}")
+            pagina.wait_for_function("window.renderMs !== undefined", timeout=120000)
+            tiempos[nombre] = pagina.evaluate("window.renderMs")
+        navegador.close()
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escala", type=int, default=1)
+    parser.add_argument("--navegador", action="store_true", help="Medir el render en Chromium (playwright).")
+    parser.add_argument("--html", help="Directorio donde escribir las páginas de medición.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = CSV_MAESTRO
+        if args.escala != 1:
+            ruta = os.path.join(tmp, f"ipc_x{args.escala}.csv")
+            generar_sintetico(ruta, args.escala)
+
+        dir_html = args.html or tmp
+        os.makedirs(dir_html, exist_ok=True)
+        paginas = {}
+        print(f"{'figura':<36}{'variante':<10}{'armado ms':>12}{'json KB':>12}")
+        for nombre, construir in figuras(ruta).items():
+            for variante, armar in [("original", construir), ("liviana", lambda: aligerar_figura(construir()))]:
+                t0 = time.perf_counter()
+                texto = pio.to_json(armar(), validate=False)
+                segundos = time.perf_counter() - t0
+                print(f"{nombre:<36}{variante:<10}{segundos * 1000:>12.1f}{len(texto) / 1024:>12.1f}")
+
+                paginas[f"{nombre}/{variante}"] = os.path.join(dir_html, f"{nombre}_{variante}.html")
+                with open(paginas[f"{nombre}/{variante}"], "w", encoding="utf-8") as f:
+                    f.write(PLANTILLA_HTML.format(json=texto))
+
+        if args.navegador:
+            for nombre, ms in render_navegador(paginas).items():
+                print(f"render {nombre:<44}{ms:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Memoria por réplica con los datos copiados en cada proceso frente al almacén compartido.
+
+Levanta ``--replicas`` procesos que cargan los datos como lo hace la app:
+
+- ``copia``: ``preparar_datos`` en cada proceso y, como ``st.cache_data``,
+  una copia deserializada por sesión (``--sesiones``);
+- ``compartido``: ``almacen.cargar_compartido``, una vista sobre los
+  archivos mapeados para todas las sesiones (``st.cache_resource``).
+
+Cada proceso recorre todas las columnas y matrices (como si atendiera
+consultas) y, con todas las réplicas vivas a la vez, informa RSS y PSS
+(``/proc/self/smaps_rollup``; PSS reparte las páginas compartidas entre
+los procesos que las usan) menos los de un proceso que sólo importó los
+módulos. Sólo Linux.
+
+    python benchmarks/bench_replicas.py --replicas 4 --sesiones 3 --escala 10
+"""
+import argparse
+import multiprocessing as mp
+import os
+import pickle
+import sys
+import tempfile
+
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from bench_nacional import generar_sintetico  # noqa: E402
+from ipc.almacen import cargar_compartido, preparar_datos  # noqa: E402
+from ipc.datos import CSV_MAESTRO  # noqa: E402
+
+
+def memoria_proceso():
+    """``(rss, pss)`` en bytes del proceso actual."""
+    valores = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for linea in f:
+            partes = linea.split()
+            if partes[0] in ("Rss:", "Pss:"):
+                valores[partes[0][:-1]] = int(partes[1]) * 1024
+    return valores["Rss"], valores["Pss"]
+
+
+def recorrer(datos):
+    """Toca todas las páginas de los datos, como lo harían las consultas."""
+    df, _, tablas, cubo = datos
+    total = 0.0
+    for columna in df.columns:
+        valores = df[columna].array
+        valores = getattr(valores, "codes", valores)
+        total += float(np.asarray(valores).view(np.uint8).sum())
+    for tabla in tablas.values():
+        total += float(np.nansum(tabla["valores"]))
+    return total + float(np.nansum(cubo["valores"]))
+
+
+def replica(modo, ruta, dir_almacen, sesiones, barrera, cola):
+    base = memoria_proceso()
+    if modo == "copia":
+        cacheado = pickle.dumps(preparar_datos(ruta), protocol=pickle.HIGHEST_PROTOCOL)
+        vivas = [pickle.loads(cacheado) for _ in range(sesiones)]
+        del cacheado
+    else:
+        compartido = cargar_compartido(ruta, dir_almacen=dir_almacen)
+        vivas = [compartido] * sesiones
+    for datos in vivas:
+        recorrer(datos)
+
+    barrera.wait()
+    rss, pss = memoria_proceso()
+    cola.put((rss - base[0], pss - base[1]))
+    barrera.wait()
+
+
+def medir(modo, ruta, dir_almacen, replicas, sesiones):
+    ctx = mp.get_context("spawn")
+    barrera = ctx.Barrier(replicas)
+    cola = ctx.Queue()
+    procesos = [
+        ctx.Process(target=replica, args=(modo, ruta, dir_almacen, sesiones, barrera, cola))
+        for _ in range(replicas)
+    ]
+    for p in procesos:
+        p.start()
+    resultados = [cola.get() for _ in procesos]
+    for p in procesos:
+        p.join()
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--replicas", type=int, default=4)
+    parser.add_argument("--sesiones", type=int, default=3)
+    parser.add_argument("--escala", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = CSV_MAESTRO
+        if args.escala != 1:
+            ruta = os.path.join(tmp, f"ipc_x{args.escala}.csv")
+            generar_sintetico(ruta, args.escala)
+        dir_almacen = os.path.join(tmp, "almacen")
+        # La publicación no entra en la medición: en producción la hace la primera réplica.
+        cargar_compartido(ruta, dir_almacen=dir_almacen)
+
+        print(f"{args.replicas} réplicas x {args.sesiones} sesiones, escala x{args.escala}")
+        print(f"{'modo':<12}{'RSS/réplica MB':>16}{'PSS/réplica MB':>16}{'PSS total MB':>14}")
+        for modo in ("copia", "compartido"):
+            resultados = medir(modo, ruta, dir_almacen, args.replicas, args.sesiones)
+            rss = np.mean([r for r, _ in resultados]) / 1e6
+            pss = np.mean([p for _, p in resultados]) / 1e6
+            print(f"{modo:<12}{rss:>16.1f}{pss:>16.1f}{pss * args.replicas:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
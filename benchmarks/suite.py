@@ -0,0 +1,270 @@
+"""Suite de benchmarks del camino de carga y de cada rerun interactivo.
+
+Mide, sin navegador, cada etapa por separado llamando a las funciones
+extraídas del script (lectura del CSV, parseo de fechas, "Región
+Nacional", esquema, índice de filtros, tabla de consultas, métricas
+derivadas, chequeos de calidad, caché en disco, filtrado de la barra
+lateral y armado de cada tipo de gráfico, incluido el mapa de calor)
+sobre el CSV del repo y sobre versiones sintéticas escaladas. Con
+``--app`` además corre el script completo con el harness de testing de
+Streamlit: carga en frío, rerun en caliente y un "▶ Ejecutar" por tipo
+de gráfico.
+
+De cada etapa se registra el mejor tiempo de ``--repeticiones`` y el
+pico de memoria asignada (tracemalloc).
+
+    python benchmarks/suite.py --escalas 1 10 --guardar base.json
+    python benchmarks/suite.py --escalas 1 10 --comparar base.json --umbral 0.5
+
+Con ``--comparar`` el proceso termina con código 1 si alguna etapa es más
+lenta que la referencia por encima del umbral relativo (y del piso
+absoluto ``--piso-ms``, para no fallar por ruido en etapas de microsegundos).
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from bench_nacional import generar_sintetico  # noqa: E402
+from ipc.agregacion import calcular_nacional  # noqa: E402
+from ipc.calidad import validar  # noqa: E402
+from ipc.consultas import construir_tabla, inflacion_acumulada, pivote, series_alineadas  # noqa: E402
+from ipc.datos import (  # noqa: E402
+    CSV_MAESTRO,
+    aplicar_esquema,
+    escribir_cache,
+    indexar_series,
+    leer_cache,
+    obtener_serie,
+)
+from ipc.graficos import figura_acumulado, figura_comparacion, figura_mapa_calor, figura_serie_temporal  # noqa: E402
+from ipc.metricas import metricas_derivadas, ranking_metrica  # noqa: E402
+from ipc.ponderaciones import pesos_regionales  # noqa: E402
+from ipc.precios import construir_cubo, meses_cubo, ranking_precios, serie_precios  # noqa: E402
+from ipc.series import (  # noqa: E402
+    INDICADORES,
+    datos_serie_temporal,
+    etiquetas_fechas,
+    fechas_hasta_interanual,
+    hasta_interanual,
+    metadatos_serie,
+    tramo_acumulado,
+)
+
+SCRIPT_APP = os.path.join(RAIZ, "reportes_ipc_plotly.py")
+SELECCION = ("variaciones", "Región Nacional", "Nivel general")
+
+
+def _seleccion(indice):
+    """Serie por defecto de la app; en los sintéticos, su primera réplica."""
+    if SELECCION in indice["series"]:
+        return SELECCION
+    return next(k for k in indice["series"] if k[:2] == SELECCION[:2] and k[2].startswith(SELECCION[2]))
+
+
+def medir(funcion, repeticiones):
+    """Mejor tiempo (s) y pico de memoria (bytes) de ``funcion``; devuelve también su resultado."""
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    funcion()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"segundos": min(tiempos), "pico_bytes": pico}, resultado
+
+
+def etapas_datos(ruta, repeticiones, dir_cache):
+    """Etapas del camino de carga y del rerun, en orden de ejecución."""
+    r = {}
+
+    r["csv_parse"], crudo = medir(lambda: pd.read_csv(ruta), repeticiones)
+
+    def parsear_fechas():
+        df = crudo.copy()
+        df["fecha"] = pd.to_datetime(df["fecha"].astype(str).str[:7], errors="coerce")
+        return df
+
+    r["fecha_parse"], df = medir(parsear_fechas, repeticiones)
+    pesos = pesos_regionales()
+    r["nacional"], nacional = medir(lambda: calcular_nacional(df, pesos), repeticiones)
+    completo = pd.concat([df, nacional], ignore_index=True)
+    r["esquema"], maestro = medir(lambda: aplicar_esquema(completo), repeticiones)
+    r["indexar_series"], (df, indice) = medir(lambda: indexar_series(maestro), repeticiones)
+    r["tabla_consultas"], tabla = medir(lambda: construir_tabla(df, indice), repeticiones)
+    tablas = {"indice": tabla, "variacion_mensual": construir_tabla(df, indice, "variacion_mensual")}
+    r["metricas_derivadas"], derivadas = medir(lambda: metricas_derivadas(tablas), repeticiones)
+    r["metadatos_serie"], _ = medir(lambda: metadatos_serie(tabla, _seleccion(indice)), repeticiones)
+    r["calidad"], _ = medir(lambda: validar(maestro), repeticiones)
+    r["cache_escritura"], _ = medir(lambda: escribir_cache(maestro, "bench", "x", dir_cache), repeticiones)
+    r["cache_lectura"], _ = medir(lambda: leer_cache("bench", "x", dir_cache), repeticiones)
+
+    # --- Rerun: filtros de la barra lateral y fechas ---
+    claves = [k for k in indice["series"] if k[0] in INDICADORES]
+    muestra = [claves[i] for i in np.random.default_rng(0).integers(len(claves), size=200)]
+
+    def filtrar():
+        for origen, region, categoria in muestra:
+            indice["regiones"].get(origen, [])
+            indice["categorias"].get((origen, region), [])
+            meta = metadatos_serie(tabla, (origen, region, categoria))
+            if meta["fechas"]:
+                hasta_interanual(meta, meta["fechas"][0])
+
+    r["rerun_filtros_x200"], _ = medir(filtrar, repeticiones)
+
+    # --- Gráficos ---
+    origen, region, categoria = _seleccion(indice)
+    for columna in INDICADORES[origen]:
+        base = obtener_serie(df, indice, origen, region, categoria).dropna(subset=[columna])
+        fechas = etiquetas_fechas(base)
+        hasta = fechas_hasta_interanual(fechas, fechas[0])[-1] if columna == "variacion_interanual" else fechas[-1]
+        datos = datos_serie_temporal(base, columna, fechas[0], hasta)
+        r[f"figura_serie_{columna}"], _ = medir(
+            lambda: figura_serie_temporal(datos, columna, categoria, region, origen), repeticiones
+        )
+
+    base = obtener_serie(df, indice, origen, region, categoria).dropna(subset=["indice"])
+    fechas = etiquetas_fechas(base)
+
+    def acumulado():
+        valor_a, _, _ = inflacion_acumulada(tabla, origen, region, categoria, fechas[0], fechas[-1])
+        return figura_acumulado(tramo_acumulado(base, fechas[0], fechas[-1], valor_a), categoria, region, origen)
+
+    r["figura_acumulado"], _ = medir(acumulado, repeticiones)
+
+    derivada = derivadas["anualizada_3m"]
+    r["ranking_metrica"], _ = medir(lambda: ranking_metrica(derivada, fechas[-1], region), repeticiones)
+
+    # --- Comparación de N series en una consulta ---
+    for n in (6, 60):
+        claves_n = [k for k in claves if k[0] == origen][:n]
+        r[f"comparar_series_x{n}"], _ = medir(
+            lambda: figura_comparacion(series_alineadas(tabla, claves_n, fechas[0], fechas[-1], True), "indice", True),
+            repeticiones,
+        )
+
+    # --- Mapa de calor: todas las categorías de la región en una matriz ---
+    claves_region = [k for k in claves if k[:2] == (origen, region)]
+    r["mapa_calor"], _ = medir(
+        lambda: figura_mapa_calor(pivote(tablas["variacion_mensual"], claves_region), "variacion_mensual", region),
+        repeticiones,
+    )
+
+    # --- Precios promedio ---
+    r["cubo_precios"], cubo = medir(lambda: construir_cubo(df), repeticiones)
+    meses = meses_cubo(cubo)
+    if meses:
+        r["precios_comparar_30"], _ = medir(
+            lambda: serie_precios(cubo, cubo["productos"][:30], cubo["regiones"], meses[0], meses[-1]), repeticiones
+        )
+        r["ranking_precios"], _ = medir(
+            lambda: ranking_precios(cubo, meses[0], meses[-1], cubo["regiones"][0]), repeticiones
+        )
+    return r
+
+
+def etapas_app(repeticiones):
+    """Script completo con ``streamlit.testing``: frío, caliente y un gráfico por tipo."""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    from ipc.almacen import olvidar_cargas
+
+    r = {}
+
+    def frio():
+        # Sin las cargas por origen del proceso ni las cachés de recursos
+        # (calidad, pivotes, metadatos) cada repetición es una carga en frío.
+        olvidar_cargas()
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        return AppTest.from_file(SCRIPT_APP, default_timeout=600).run()
+
+    r["app_carga_fria"], at = medir(frio, repeticiones)
+    r["app_rerun_caliente"], _ = medir(lambda: at.run(), repeticiones)
+
+    def ejecutar(tipo, columna):
+        [w for w in at.sidebar.radio if w.label == "Tipo de gráfico"][0].set_value(tipo).run()
+        [w for w in at.sidebar.selectbox if w.label == "Indicador a graficar"][0].set_value(columna).run()
+        return at.sidebar.button[0].click().run()
+
+    for columna in INDICADORES["variaciones"]:
+        r[f"app_serie_{columna}"], _ = medir(lambda: ejecutar("Serie temporal", columna), repeticiones)
+    r["app_acumulado"], _ = medir(lambda: ejecutar("Acumulado entre fechas", "indice"), repeticiones)
+    return r
+
+
+def comparar(resultados, referencia, umbral, piso_ms):
+    """Etapas más lentas que ``referencia`` por encima de ``umbral`` (relativo) y ``piso_ms``."""
+    regresiones = []
+    for escala, etapas in resultados.items():
+        for etapa, medida in etapas.items():
+            previa = referencia.get(escala, {}).get(etapa)
+            if previa is None:
+                continue
+            actual, antes = medida["segundos"], previa["segundos"]
+            if actual > antes * (1 + umbral) and (actual - antes) * 1000 > piso_ms:
+                regresiones.append((escala, etapa, antes, actual))
+    return regresiones
+
+
+def imprimir(resultados):
+    print(f"{'escala':<8}{'etapa':<32}{'ms':>12}{'pico MB':>12}")
+    for escala, etapas in resultados.items():
+        for etapa, medida in etapas.items():
+            print(f"{escala:<8}{etapa:<32}{medida['segundos'] * 1000:>12.2f}{medida['pico_bytes'] / 1e6:>12.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escalas", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--app", action="store_true", help="Incluir el script completo vía streamlit.testing.")
+    parser.add_argument("--guardar", help="Guardar los resultados en este JSON.")
+    parser.add_argument("--comparar", help="JSON de referencia para detectar regresiones.")
+    parser.add_argument("--umbral", type=float, default=0.5)
+    parser.add_argument("--piso-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    resultados = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for escala in args.escalas:
+            ruta = CSV_MAESTRO
+            if escala != 1:
+                ruta = os.path.join(tmp, f"ipc_x{escala}.csv")
+                generar_sintetico(ruta, escala)
+            resultados[f"x{escala}"] = etapas_datos(ruta, args.repeticiones, os.path.join(tmp, "cache"))
+        if args.app:
+            resultados["app"] = etapas_app(args.repeticiones)
+
+    imprimir(resultados)
+
+    if args.guardar:
+        with open(args.guardar, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            referencia = json.load(f)
+        regresiones = comparar(resultados, referencia, args.umbral, args.piso_ms)
+        for escala, etapa, antes, actual in regresiones:
+            print(f"REGRESIÓN {escala}/{etapa}: {antes * 1000:.2f} ms -> {actual * 1000:.2f} ms")
+        if regresiones:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+"""Datos, cálculos y reportes del IPC.
+
+Los módulos se agrupan en capas:
+
+- datos: ``datos`` (maestro y caché en disco), ``ponderaciones``,
+  ``consultas``, ``precios``, ``series``, ``calidad``, ``ingesta``,
+  ``almacen`` y ``exportar``;
+- agregación: ``agregacion`` ("Región Nacional") y ``metricas``;
+- servicio: ``api`` (ASGI, sin Streamlit ni plotly);
+- presentación: ``graficos`` (plotly), ``reportes_lote`` y ``app``
+  (Streamlit; ``reportes_ipc_plotly.py`` es su punto de entrada).
+
+Sólo la presentación importa plotly o Streamlit, así que la ingesta, los
+chequeos y la API arrancan sin pagar esas importaciones
+(``benchmarks/bench_importacion.py`` lo mide). Este archivo no importa
+ningún módulo.
+"""
@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+REGION_NACIONAL = "Región Nacional"
+
+CLAVES_NACIONAL = ["fecha", "categoria", "origen"]
+
+
+def normalizar_pesos(pesos):
+    """Devuelve los pesos escalados para que sumen 1."""
+    factor = sum(pesos.values())
+    return {k: v / factor for k, v in pesos.items()}
+
+
+def _codificar(columnas):
+    """Codifica varias columnas como un único entero ordenado lexicográficamente.
+
+    Devuelve los códigos por fila (-1 si alguna clave es nula) y, por
+    columna, los valores únicos ordenados.
+    """
+    codigos = np.zeros(len(columnas[0]), dtype=np.int64)
+    validos = np.ones(len(columnas[0]), dtype=bool)
+    uniques = []
+    for col in columnas:
+        cod, uniq = pd.factorize(col, sort=True)
+        validos &= cod >= 0
+        codigos = codigos * len(uniq) + cod
+        uniques.append(uniq)
+    codigos[~validos] = -1
+    return codigos, uniques
+
+
+def pct_change_por_serie(valores, series, periodos=1):
+    """Equivalente vectorizado de ``groupby(series).pct_change(periodos)``.
+
+    ``valores`` y ``series`` deben venir ordenados por serie y, dentro de
+    cada serie, por fecha.
+    """
+    valores = np.asarray(valores, dtype="float64")
+    series = np.asarray(series)
+    out = np.full(len(valores), np.nan)
+    if len(valores) > periodos:
+        misma = series[periodos:] == series[:-periodos]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = valores[periodos:] / valores[:-periodos] - 1
+        out[periodos:] = np.where(misma, ratio, np.nan)
+    return out * 100
+
+
+def calcular_variaciones(df, claves=("categoria", "origen"), columna="indice"):
+    """Agrega ``variacion_mensual`` y ``variacion_interanual`` a partir de ``columna``.
+
+    Cada serie queda definida por ``claves``; las variaciones se calculan
+    sobre las filas de la serie ordenadas por fecha.
+    """
+    serie, _ = _codificar([df[c].to_numpy() for c in claves])
+    orden = np.lexsort((df["fecha"].to_numpy(), serie))
+    valores = df[columna].to_numpy(dtype="float64")[orden]
+    serie = serie[orden]
+
+    mensual = np.empty(len(df))
+    interanual = np.empty(len(df))
+    mensual[orden] = pct_change_por_serie(valores, serie, 1)
+    interanual[orden] = pct_change_por_serie(valores, serie, 12)
+
+    df = df.copy()
+    df["variacion_mensual"] = mensual
+    df["variacion_interanual"] = interanual
+    return df
+
+
+def calcular_nacional(df, pesos=None):
+    """Calcula la serie "Región Nacional" como promedio ponderado de las regiones.
+
+    Las regiones se pivotean a columnas de una matriz (fecha × categoría ×
+    origen) × región y el índice nacional sale de un único producto
+    matriz–vector contra los pesos normalizados. Conserva la semántica del
+    cálculo por grupo original: filas duplicadas se suman, una región
+    ausente no aporta y un índice nulo anula el resultado del grupo.
+
+    Sin ``pesos`` se usa la importancia de cada región según
+    ``ponderaciones.pesos_regionales``, la misma definición que la caché,
+    la ingesta y la app.
+    """
+    if pesos is None:
+        # Import diferido: ``ponderaciones`` importa este módulo.
+        from .ponderaciones import pesos_regionales
+        pesos = pesos_regionales()
+    pesos = normalizar_pesos(pesos)
+    regiones = list(pesos)
+
+    base = df[df["region"].isin(regiones)]
+    codigos, uniques = _codificar([base[c].to_numpy() for c in CLAVES_NACIONAL])
+    validos = codigos >= 0
+    codigos = codigos[validos]
+    region_cod = pd.Categorical(base["region"].to_numpy()[validos], categories=regiones).codes
+    valores = base["indice"].to_numpy(dtype="float64")[validos]
+
+    grupos, fila = np.unique(codigos, return_inverse=True)
+    n_regiones = len(regiones)
+    matriz = np.bincount(
+        fila * n_regiones + region_cod,
+        weights=valores,
+        minlength=len(grupos) * n_regiones,
+    ).reshape(len(grupos), n_regiones)
+    indice = matriz @ np.array([pesos[r] for r in regiones])
+
+    # --- Decodificar las claves de cada grupo ---
+    columnas = {}
+    resto = grupos
+    for nombre, uniq in reversed(list(zip(CLAVES_NACIONAL, uniques))):
+        columnas[nombre] = uniq[resto % len(uniq)]
+        resto = resto // len(uniq)
+
+    ipc_nacional = pd.DataFrame({c: columnas[c] for c in CLAVES_NACIONAL})
+    ipc_nacional["indice"] = indice
+    ipc_nacional = calcular_variaciones(ipc_nacional)
+    ipc_nacional["region"] = REGION_NACIONAL
+    return ipc_nacional
+
+
+def agregar_nacional(df, pesos=None):
+    """Devuelve ``df`` con las filas de "Región Nacional" anexadas."""
+    return pd.concat([df, calcular_nacional(df, pesos)], ignore_index=True)
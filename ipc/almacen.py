@@ -0,0 +1,215 @@
+"""Datos preprocesados de la app en un almacén de sólo lectura compartido entre procesos.
+
+Con varias réplicas de Streamlit por host cada proceso guarda su propia
+copia del maestro, las tablas de ``consultas`` y el cubo de precios, y
+``st.cache_data`` además entrega una copia por sesión. Acá esos datos se
+publican una vez por versión como archivos ``.npy`` (una columna o
+matriz por archivo) más un ``meta.pkl`` chico con categorías e índices;
+cada proceso los abre con ``mmap`` y arma el frame y las tablas como
+vistas sobre esas páginas, que el sistema operativo comparte entre
+todas las réplicas.
+
+    IPC_DATOS_COMPARTIDOS=1 streamlit run reportes_ipc_plotly.py
+
+La app carga cada origen por separado (``datos_origen``): primero el que
+muestra y después, en un hilo aparte (``precargar``), los demás.
+"""
+import glob
+import os
+import pickle
+import shutil
+import threading
+from concurrent.futures import Future, wait
+
+import numpy as np
+import pandas as pd
+
+from .consultas import construir_tabla
+from .datos import CSV_MAESTRO, DIR_CACHE, cargar_maestro, cargar_origen, huella, indexar_series
+from .metricas import metricas_derivadas
+from .ponderaciones import CSV_PONDERACIONES, pesos_regionales
+from .precios import ORIGEN_PRECIOS, construir_cubo
+from .series import INDICADORES
+
+DIR_ALMACEN = os.environ.get("IPC_ALMACEN_DIR", os.path.join(DIR_CACHE, "almacen"))
+VERSION_ALMACEN = 3
+# Si está activo, la app y la API sirven los datos desde el almacén compartido.
+DATOS_COMPARTIDOS = os.environ.get("IPC_DATOS_COMPARTIDOS", "") not in ("", "0")
+
+# Columnas con tabla densa serie × mes en ``consultas``.
+COLUMNAS_TABLAS = sorted({c for columnas in INDICADORES.values() for c in columnas})
+
+
+def preparar_datos(ruta=CSV_MAESTRO, columnas_tablas=COLUMNAS_TABLAS, origen=None):
+    """``(df, indice, tablas, cubo)`` que usa la app, armados en este proceso.
+
+    Con ``origen`` sólo se cargan sus filas y columnas, las tablas de sus
+    indicadores y, si es el de precios, el cubo (si no, ``cubo`` es ``None``).
+    Si hay tabla de ``indice`` se agregan las de ``metricas.METRICAS``.
+    """
+    if origen is None:
+        df, indice = indexar_series(cargar_maestro(ruta))
+        tablas = {c: construir_tabla(df, indice, c) for c in columnas_tablas}
+    else:
+        df, indice = indexar_series(cargar_origen(origen, ruta))
+        tablas = {c: construir_tabla(df, indice, c) for c in columnas_tablas if c in INDICADORES.get(origen, [])}
+    if "indice" in tablas:
+        # Métricas derivadas, guardadas junto a las variaciones del maestro.
+        tablas.update(metricas_derivadas(tablas))
+    cubo = construir_cubo(df) if origen in (None, ORIGEN_PRECIOS) else None
+    return df, indice, tablas, cubo
+
+
+def _ruta_almacen(origen, clave, dir_almacen):
+    return os.path.join(dir_almacen, f"datos_{origen or 'maestro'}_{clave}")
+
+
+def publicar(destino, df, indice, tablas, cubo):
+    """Escribe los datos en el directorio ``destino`` en el formato que lee ``abrir``."""
+    os.makedirs(destino, exist_ok=True)
+    meta = {"columnas": list(df.columns), "categorias": {}, "indice": indice, "tablas": {}, "cubo": {}}
+    for i, columna in enumerate(df.columns):
+        serie = df[columna]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            meta["categorias"][columna] = serie.dtype
+            valores = serie.array.codes
+        else:
+            valores = serie.to_numpy()
+        np.save(os.path.join(destino, f"col_{i}.npy"), valores)
+
+    for columna, tabla in tablas.items():
+        np.save(os.path.join(destino, f"tabla_{columna}.npy"), tabla["valores"])
+        meta["tablas"][columna] = {k: v for k, v in tabla.items() if k != "valores"}
+    if cubo is not None:
+        np.save(os.path.join(destino, "cubo.npy"), cubo["valores"])
+        meta["cubo"] = {k: v for k, v in cubo.items() if k != "valores"}
+    else:
+        meta["cubo"] = None
+
+    with open(os.path.join(destino, "meta.pkl"), "wb") as f:
+        pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def abrir(origen):
+    """``(df, indice, tablas, cubo)`` como vistas de sólo lectura sobre los archivos de ``origen``."""
+    with open(os.path.join(origen, "meta.pkl"), "rb") as f:
+        meta = pickle.load(f)
+
+    def mapear(nombre):
+        return np.load(os.path.join(origen, nombre), mmap_mode="r")
+
+    columnas = {}
+    for i, columna in enumerate(meta["columnas"]):
+        valores = mapear(f"col_{i}.npy")
+        if columna in meta["categorias"]:
+            valores = pd.Categorical.from_codes(valores, dtype=meta["categorias"][columna])
+        columnas[columna] = valores
+    df = pd.DataFrame(columnas, copy=False)
+
+    tablas = {c: {**t, "valores": mapear(f"tabla_{c}.npy")} for c, t in meta["tablas"].items()}
+    cubo = {**meta["cubo"], "valores": mapear("cubo.npy")} if meta["cubo"] is not None else None
+    return df, meta["indice"], tablas, cubo
+
+
+def cargar_compartido(ruta=CSV_MAESTRO, pesos=None, dir_almacen=DIR_ALMACEN, origen=None):
+    """Como ``preparar_datos`` pero servido desde el almacén compartido.
+
+    La primera réplica que no encuentra la versión actual la arma y la
+    publica (en un directorio temporal que después se renombra, así nadie
+    abre un almacén a medio escribir); las demás sólo la mapean. Si el
+    directorio no admite escritura se devuelven los datos en memoria.
+    """
+    pesos = pesos_regionales() if pesos is None else pesos
+    # Las ponderaciones entran en la clave: la incidencia mensual depende de ellas.
+    clave = f"{huella([ruta, CSV_PONDERACIONES], pesos)}v{VERSION_ALMACEN}"
+    destino = _ruta_almacen(origen, clave, dir_almacen)
+    if os.path.exists(os.path.join(destino, "meta.pkl")):
+        return abrir(destino)
+
+    datos = preparar_datos(ruta, origen=origen)
+    tmp = f"{destino}.{os.getpid()}.tmp"
+    try:
+        publicar(tmp, *datos)
+        os.rename(tmp, destino)
+    except OSError:
+        # Otra réplica lo publicó primero, o no se puede escribir.
+        shutil.rmtree(tmp, ignore_errors=True)
+        if not os.path.exists(os.path.join(destino, "meta.pkl")):
+            return datos
+
+    # Las versiones viejas pueden seguir mapeadas por otras réplicas: en
+    # POSIX borrar los archivos no invalida esos mapeos.
+    for viejo in glob.glob(_ruta_almacen(origen, "*", dir_almacen)):
+        if viejo != destino and not viejo.endswith(".tmp"):
+            shutil.rmtree(viejo, ignore_errors=True)
+    return abrir(destino)
+
+
+def obtener_datos(compartidos=None, origen=None):
+    """Datos de la app: del almacén compartido si ``compartidos`` (por defecto ``IPC_DATOS_COMPARTIDOS``).
+
+    Sin ``origen`` se cargan todos los orígenes juntos.
+    """
+    compartidos = DATOS_COMPARTIDOS if compartidos is None else compartidos
+    return cargar_compartido(origen=origen) if compartidos else preparar_datos(origen=origen)
+
+
+# --- Carga por origen ---
+# Una carga por (origen, versión del maestro) en el proceso, compartida
+# entre la app y el hilo de ``precargar``.
+_cargas = {}
+_lock_cargas = threading.Lock()
+
+
+def _reservar(origen, version, compartidos):
+    """``(futuro, propio)`` de la carga; si ``propio``, hacerla le toca a quien llama."""
+    clave = (origen, version, compartidos)
+    with _lock_cargas:
+        if clave in _cargas:
+            return _cargas[clave], False
+        for vieja in [c for c in _cargas if c[1] != version]:
+            del _cargas[vieja]
+        futuro = _cargas[clave] = Future()
+        return futuro, True
+
+
+def _cargar(futuro, origen, version, compartidos):
+    try:
+        futuro.set_result(obtener_datos(compartidos, origen))
+    except BaseException as e:
+        # Sin dejar el error cacheado: el próximo pedido lo reintenta.
+        with _lock_cargas:
+            _cargas.pop((origen, version, compartidos), None)
+        futuro.set_exception(e)
+
+
+def datos_origen(origen, version, compartidos=None):
+    """``obtener_datos`` de ``origen``; si ``precargar`` ya lo está armando, espera ese resultado."""
+    futuro, propio = _reservar(origen, version, compartidos)
+    if propio:
+        _cargar(futuro, origen, version, compartidos)
+    return futuro.result()
+
+
+def _precargar(reservas, version, compartidos):
+    for futuro, origen in reservas:
+        _cargar(futuro, origen, version, compartidos)
+
+
+def precargar(origenes, version, compartidos=None):
+    """Carga en un hilo aparte los ``origenes`` que todavía no se pidieron, sin bloquear."""
+    reservas = []
+    for origen in origenes:
+        futuro, propio = _reservar(origen, version, compartidos)
+        if propio:
+            reservas.append((futuro, origen))
+    if reservas:
+        threading.Thread(target=_precargar, args=(reservas, version, compartidos), daemon=True).start()
+
+
+def olvidar_cargas():
+    """Descarta las cargas por origen del proceso (para medir en frío); antes espera las que siguen en curso."""
+    with _lock_cargas:
+        futuros = list(_cargas.values())
+        _cargas.clear()
+    wait(futuros)
@@ -0,0 +1,295 @@
+"""API HTTP/JSON de sólo lectura sobre los datos del IPC, sin Streamlit.
+
+    python -m ipc.api --puerto 8000
+    uvicorn ipc.api:app --port 8000 --workers 4
+
+Es una aplicación ASGI sin framework (sólo hace falta ``uvicorn`` para
+servirla) que carga los datos igual que la app (``almacen.obtener_datos``,
+con "Región Nacional" y las tablas de ``consultas``) y los recarga
+cuando la ingesta modifica el CSV maestro. Todas las rutas son GET:
+
+- ``/version``: versión y huella de los datos;
+- ``/series?origen=&region=``: series disponibles;
+- ``/serie?region=&categoria=&columna=&desde=&hasta=``: valores mes a mes;
+- ``/acumulada?region=&categoria=&desde=&hasta=``: inflación acumulada;
+- ``/actualizar?region=&categoria=&desde=&hasta=&monto=[&monto_final=]``.
+
+``origen`` es ``variaciones`` si no se indica y los meses van como
+``AAAA-MM``. ``columna`` admite también las métricas derivadas
+(``metricas.METRICAS``). Cada respuesta lleva un ETag derivado de la huella de los
+datos y de la consulta: un ``If-None-Match`` que coincide se contesta
+con 304 sin calcular nada, y los cuerpos se cachean (LRU) por la misma
+clave.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl
+
+import numpy as np
+
+from .almacen import obtener_datos
+from .consultas import diferencia_real, inflacion_acumulada, mes_absoluto
+from .datos import version_maestro
+
+ORIGEN_POR_DEFECTO = "variaciones"
+# Segundos entre chequeos de la versión del CSV maestro.
+INTERVALO_VERSION = 2.0
+MAX_RESPUESTAS = 4096
+
+_estado = {"version": None, "datos": None, "huella": None, "chequeado": 0.0}
+_recarga = None
+_respuestas = OrderedDict()
+_lock = threading.Lock()
+
+
+class ErrorConsulta(Exception):
+    """Error de la consulta con el código HTTP a devolver."""
+
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+# --- Datos ---
+
+def _cargar(version):
+    df, indice, tablas, cubo = obtener_datos()
+    huella = hashlib.sha1("|".join(tablas[c]["huella"] for c in sorted(tablas)).encode()).hexdigest()[:16]
+    _estado.update(version=version, datos=(df, indice, tablas, cubo), huella=huella)
+
+
+async def datos_actuales():
+    """Datos cargados, recargándolos (fuera del event loop) si cambió el CSV maestro."""
+    global _recarga
+    ahora = time.monotonic()
+    if _estado["datos"] is not None and ahora - _estado["chequeado"] < INTERVALO_VERSION:
+        return _estado
+    _estado["chequeado"] = ahora
+
+    version = version_maestro()
+    if version != _estado["version"]:
+        # Una sola recarga aunque lleguen varias consultas a la vez.
+        if _recarga is None:
+            _recarga = asyncio.ensure_future(asyncio.to_thread(_cargar, version))
+        try:
+            await _recarga
+        finally:
+            _recarga = None
+    return _estado
+
+
+# --- Consultas ---
+
+def _param(consulta, nombre, defecto=None):
+    valor = consulta.get(nombre, defecto)
+    if valor is None:
+        raise ErrorConsulta(400, f"Falta el parámetro '{nombre}'")
+    return valor
+
+
+def _numero(consulta, nombre, defecto=None):
+    texto = _param(consulta, nombre, defecto)
+    try:
+        valor = float(texto)
+    except ValueError:
+        raise ErrorConsulta(400, f"'{nombre}' debe ser numérico: {texto!r}") from None
+    if not math.isfinite(valor):
+        raise ErrorConsulta(400, f"'{nombre}' debe ser un número finito: {texto!r}")
+    return valor
+
+
+def _mes(consulta, nombre, defecto=None):
+    texto = _param(consulta, nombre, defecto)
+    if len(texto) != 7 or texto[4] != "-" or not (texto[:4] + texto[5:]).isdigit() or not 1 <= int(texto[5:]) <= 12:
+        raise ErrorConsulta(400, f"'{nombre}' debe tener formato AAAA-MM (mes 01 a 12): {texto!r}")
+    return texto
+
+
+def _clave_serie(datos, consulta):
+    clave = (consulta.get("origen", ORIGEN_POR_DEFECTO), _param(consulta, "region"), _param(consulta, "categoria"))
+    if clave not in datos[1]["series"]:
+        raise ErrorConsulta(404, f"No existe la serie {clave}")
+    return clave
+
+
+def _flotante(v):
+    v = float(v)
+    return None if math.isnan(v) or math.isinf(v) else v
+
+
+def consulta_version(estado, consulta):
+    return {"version": estado["version"], "huella": estado["huella"]}
+
+
+def consulta_series(estado, consulta):
+    origen, region = consulta.get("origen"), consulta.get("region")
+    return [
+        {"origen": o, "region": r, "categoria": c}
+        for o, r, c in estado["datos"][1]["series"]
+        if (origen is None or o == origen) and (region is None or r == region)
+    ]
+
+
+def consulta_serie(estado, consulta):
+    _, _, tablas, _ = estado["datos"]
+    clave = _clave_serie(estado["datos"], consulta)
+    columna = consulta.get("columna", "indice")
+    if columna not in tablas:
+        raise ErrorConsulta(400, f"'columna' debe ser una de {sorted(tablas)}")
+    tabla = tablas[columna]
+    n_meses = tabla["valores"].shape[1]
+    ini = max(mes_absoluto(_mes(consulta, "desde", "1900-01")) - tabla["mes0"], 0)
+    fin = min(mes_absoluto(_mes(consulta, "hasta", "2999-12")) - tabla["mes0"], n_meses - 1)
+    # Acceso directo a la fila de la tabla: sin armar un frame por consulta.
+    valores = tabla["valores"][tabla["filas"][clave], ini:fin + 1]
+    presentes = np.flatnonzero(~np.isnan(valores))
+    fechas = (presentes + ini + tabla["mes0"]).astype("datetime64[M]").astype(str)
+    return {
+        "serie": dict(zip(("origen", "region", "categoria"), clave)),
+        "columna": columna,
+        "valores": [{"fecha": f, "valor": v} for f, v in zip(fechas.tolist(), valores[presentes].tolist())],
+    }
+
+
+def _acumulada(estado, consulta):
+    clave = _clave_serie(estado["datos"], consulta)
+    desde, hasta = _mes(consulta, "desde"), _mes(consulta, "hasta")
+    resultado = inflacion_acumulada(estado["datos"][2]["indice"], *clave, desde, hasta)
+    if resultado is None:
+        raise ErrorConsulta(404, f"Sin índice para {clave} en {desde} o {hasta}")
+    return clave, desde, hasta, resultado
+
+
+def consulta_acumulada(estado, consulta):
+    clave, desde, hasta, (valor_a, valor_b, inflacion) = _acumulada(estado, consulta)
+    return {
+        "serie": dict(zip(("origen", "region", "categoria"), clave)),
+        "desde": desde,
+        "hasta": hasta,
+        "indice_desde": _flotante(valor_a),
+        "indice_hasta": _flotante(valor_b),
+        "inflacion_acumulada": _flotante(inflacion),
+    }
+
+
+def consulta_actualizar(estado, consulta):
+    respuesta = consulta_acumulada(estado, consulta)
+    monto = _numero(consulta, "monto")
+    if monto <= 0:
+        raise ErrorConsulta(400, f"'monto' debe ser mayor que 0: {monto!r}")
+    respuesta["monto"] = monto
+    respuesta["monto_actualizado"] = _flotante(monto * respuesta["indice_hasta"] / respuesta["indice_desde"])
+    if "monto_final" in consulta:
+        pesos, pct = diferencia_real(_numero(consulta, "monto_final"), respuesta["monto_actualizado"])
+        respuesta.update(diferencia_pesos=_flotante(pesos), diferencia_pct=_flotante(pct))
+    return respuesta
+
+
+RUTAS = {
+    "/version": consulta_version,
+    "/series": consulta_series,
+    "/serie": consulta_serie,
+    "/acumulada": consulta_acumulada,
+    "/actualizar": consulta_actualizar,
+}
+
+
+# --- HTTP ---
+
+def _etag(huella, ruta, consulta):
+    h = hashlib.sha1(f"{huella}|{ruta}|{sorted(consulta.items())}".encode())
+    return f'"{h.hexdigest()[:20]}"'
+
+
+def responder(estado, ruta, consulta, etag):
+    """``(código, cuerpo)`` de una consulta, cacheado por su ``etag``."""
+    with _lock:
+        if etag in _respuestas:
+            _respuestas.move_to_end(etag)
+            return _respuestas[etag]
+
+    try:
+        codigo, cuerpo = 200, RUTAS[ruta](estado, consulta)
+    except ErrorConsulta as e:
+        codigo, cuerpo = e.estado, {"error": str(e)}
+    resultado = (codigo, json.dumps(cuerpo, ensure_ascii=False, allow_nan=False).encode())
+    with _lock:
+        _respuestas[etag] = resultado
+        while len(_respuestas) > MAX_RESPUESTAS:
+            _respuestas.popitem(last=False)
+    return resultado
+
+
+async def _enviar(send, codigo, cuerpo=b"", encabezados=(), sin_cuerpo=False):
+    """Respuesta completa; con ``sin_cuerpo`` (HEAD) se omite el cuerpo pero no su largo."""
+    await send({
+        "type": "http.response.start",
+        "status": codigo,
+        "headers": [
+            (b"content-type", b"application/json; charset=utf-8"),
+            (b"content-length", str(len(cuerpo)).encode()),
+            *encabezados,
+        ],
+    })
+    await send({"type": "http.response.body", "body": b"" if sin_cuerpo else cuerpo})
+
+
+async def app(scope, receive, send):
+    """Aplicación ASGI."""
+    if scope["type"] == "lifespan":
+        while True:
+            mensaje = await receive()
+            if mensaje["type"] == "lifespan.startup":
+                await datos_actuales()
+                await send({"type": "lifespan.startup.complete"})
+            elif mensaje["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    if scope["type"] != "http":
+        return
+    if scope["method"] not in ("GET", "HEAD"):
+        await _enviar(send, 405, b'{"error": "S\\u00f3lo GET"}', [(b"allow", b"GET, HEAD")])
+        return
+    ruta = scope["path"].rstrip("/") or "/"
+    if ruta not in RUTAS:
+        await _enviar(send, 404, json.dumps({"error": "Ruta inexistente", "rutas": sorted(RUTAS)}).encode(),
+                      sin_cuerpo=scope["method"] == "HEAD")
+        return
+
+    estado = await datos_actuales()
+    consulta = dict(parse_qsl(scope["query_string"].decode("utf-8", "replace")))
+    etag = _etag(estado["huella"], ruta, consulta)
+    encabezados = [(b"etag", etag.encode()), (b"cache-control", b"no-cache")]
+
+    # Sólo las respuestas 200 llevan ETag, así que coincidir implica 200.
+    si_no_coincide = dict(scope["headers"]).get(b"if-none-match", b"").decode("latin-1")
+    if etag in [e.strip() for e in si_no_coincide.split(",")]:
+        await _enviar(send, 304, b"", encabezados)
+        return
+
+    codigo, cuerpo = responder(estado, ruta, consulta, etag)
+    await _enviar(send, codigo, cuerpo, encabezados if codigo == 200 else [], sin_cuerpo=scope["method"] == "HEAD")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("Para servir la API hace falta uvicorn: pip install uvicorn") from None
+    uvicorn.run("ipc.api:app", host=args.host, port=args.puerto, workers=args.workers, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
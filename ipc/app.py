@@ -0,0 +1,543 @@
+"""App de Streamlit con los reportes del IPC (capa de presentación).
+
+    streamlit run reportes_ipc_plotly.py
+
+``reportes_ipc_plotly.py`` sólo llama a ``main`` en cada rerun. Acá
+quedan las cachés de Streamlit y una función por modo de la barra
+lateral (``MODOS``), que se pueden importar y medir por separado; los
+datos y los cálculos vienen de los módulos de datos y agregación, que
+no importan Streamlit ni plotly.
+"""
+import io
+import os
+import tempfile
+
+import pandas as pd
+import streamlit as st
+
+from .agregacion import REGION_NACIONAL
+from .almacen import DATOS_COMPARTIDOS, datos_origen, precargar
+from .calidad import resumen, validar
+from .consultas import actualizar_archivo, inflacion_acumulada, meses_con_datos, pivote, series_alineadas
+from .datos import obtener_serie, origenes_maestro, version_maestro
+from .graficos import (
+    aligerar_figura,
+    clave_figura,
+    figura_acumulado,
+    figura_comparacion,
+    figura_compuestos,
+    figura_mapa_calor,
+    figura_precios,
+    figura_ranking_metrica,
+    figura_ranking_precios,
+    figura_serie_temporal,
+    obtener_figura,
+)
+from .metricas import METRICAS, METRICAS_MAESTRO, ORIGEN_METRICAS, meses_ranking, ranking_metrica
+from .ponderaciones import CUADRO_DIVISIONES, cargar_ponderaciones, indices_compuestos_cacheados, pesos_cuadro
+from .precios import ORIGEN_PRECIOS, meses_cubo, ranking_precios, serie_precios, variacion_precios
+from .series import (
+    INDICADORES,
+    SIN_OPCIONES,
+    TIPOS_GRAFICO,
+    datos_serie_temporal,
+    hasta_interanual,
+    metadatos_serie,
+    tramo_acumulado,
+)
+
+MODO_GRAFICOS = "Gráficos"
+MODO_COMPARAR = "Comparar series"
+MODO_COMPUESTOS = "Índices compuestos"
+MODO_PRECIOS = "Precios promedio"
+MODO_RANKING = "Ranking de categorías"
+MODO_CALOR = "Mapa de calor"
+MODO_MASIVO = "Actualización masiva de montos"
+
+EJE_CATEGORIA = "Categorías de una región"
+EJE_REGION = "Regiones de una categoría"
+
+
+# --- Cachés ---
+# Cada origen se carga por separado: el primer gráfico sólo espera al
+# origen que muestra y los demás se cargan en segundo plano.
+# Con IPC_DATOS_COMPARTIDOS=1 los datos se mapean desde el almacén en disco
+# y todas las sesiones (y réplicas) comparten las mismas páginas; si no,
+# cada sesión recibe su copia de st.cache_data.
+def cargar_datos(version, origen):
+    # `version` cambia cuando la ingesta anexa meses al CSV y fuerza la recarga.
+    return datos_origen(origen, version)
+
+
+cargar_datos = (st.cache_resource if DATOS_COMPARTIDOS else st.cache_data)(max_entries=4)(cargar_datos)
+
+
+@st.cache_data(max_entries=1)
+def cargar_origenes(version):
+    return origenes_maestro()
+
+
+@st.cache_resource(max_entries=4)
+def cargar_fechas_series(version, origen):
+    # Meses de cada serie para los selectores "Desde"/"Hasta", por indicador.
+    # Se arman la primera vez que se elige cada serie (no todas antes del
+    # primer gráfico) y cache_resource comparte el mismo objeto (sólo
+    # lectura) entre reruns y sesiones.
+    return {}
+
+
+def fechas_serie(version, tablas, columna, clave):
+    memo = cargar_fechas_series(version, clave[0]).setdefault(columna, {})
+    if clave not in memo:
+        memo[clave] = metadatos_serie(tablas[columna], clave)
+    return memo[clave]
+
+
+@st.cache_resource(max_entries=1)
+def cargar_calidad(version):
+    # Reporte de calidad de todos los orígenes, una vez por versión.
+    return pd.concat([validar(cargar_datos(version, o)[0]) for o in cargar_origenes(version)], ignore_index=True)
+
+
+@st.cache_resource(max_entries=32)
+def cargar_pivote(version, origen, columna, eje, fijo):
+    # Una matriz por (origen, región) o (origen, categoría): el mapa de
+    # calor sale de un solo acceso a la tabla, no de una consulta por serie.
+    _, indice, tablas, _ = cargar_datos(version, origen)
+    if eje == EJE_CATEGORIA:
+        claves = [(origen, fijo, c) for c in indice["categorias"].get((origen, fijo), [])]
+        return pivote(tablas[columna], claves)
+    claves = [(origen, r, fijo) for r in indice["regiones"].get(origen, [])]
+    return pivote(tablas[columna], claves, [r for _, r, _ in claves])
+
+
+def datos_de(version, origenes_datos, origen):
+    datos = cargar_datos(version, origen)
+    precargar(origenes_datos, version)
+    return datos
+
+
+# --- Render liviano: WebGL, LTTB y rótulos raleados en figuras grandes ---
+def preparar(fig, liviano):
+    return aligerar_figura(fig) if liviano else fig
+
+
+# --- Calidad de datos ---
+# El panel ocupa su lugar en la barra lateral antes del modo, pero el
+# reporte se arma después del gráfico: el primer gráfico no lo espera y la
+# etiqueta muestra los hallazgos sin abrir el panel.
+def panel_calidad(version, lugar):
+    reporte_calidad = cargar_calidad(version)
+    errores_calidad = int((reporte_calidad["severidad"] == "error").sum())
+    etiqueta = f"Calidad de datos ({len(reporte_calidad)} hallazgos"
+    etiqueta += f", {errores_calidad} errores)" if errores_calidad else ")"
+    with lugar.expander(etiqueta):
+        if errores_calidad:
+            st.error(f"{errores_calidad} errores: hay filas inválidas o duplicadas en el maestro.")
+        if reporte_calidad.empty:
+            st.write("Sin hallazgos.")
+        else:
+            st.dataframe(resumen(reporte_calidad), hide_index=True)
+            st.download_button("Descargar reporte (CSV)", reporte_calidad.to_csv(index=False).encode("utf-8"),
+                               file_name="calidad_ipc.csv", mime="text/csv")
+
+
+# === COMPARAR SERIES ===
+def modo_comparar(version, origenes_datos, liviano):
+    st.header("📊 Comparación de series")
+    origenes_c = [o for o in origenes_datos if o in INDICADORES]
+    origen_c = st.sidebar.selectbox("Origen", origenes_c)
+    _, indice, tablas, _ = datos_de(version, origenes_datos, origen_c)
+    columna_c = st.sidebar.selectbox("Indicador a graficar", INDICADORES[origen_c] + [m for m in METRICAS if m in tablas])
+    regiones_todas = indice["regiones"].get(origen_c, [])
+    regiones_c = st.sidebar.multiselect("Regiones", regiones_todas, default=regiones_todas)
+    categorias_todas = sorted({c for r in regiones_c for c in indice["categorias"].get((origen_c, r), [])})
+    categorias_c = st.sidebar.multiselect(
+        "Categorías", categorias_todas, default=["Nivel general"] if "Nivel general" in categorias_todas else []
+    )
+    claves_c = [(origen_c, r, c) for r in regiones_c for c in categorias_c]
+
+    meses_c = meses_con_datos(tablas[columna_c], claves_c)
+    if not meses_c:
+        st.info("Elegí al menos una región y una categoría con datos.")
+        return
+    desde_c = st.sidebar.selectbox("Desde", meses_c, index=0)
+    hasta_c = st.sidebar.selectbox("Hasta", list(reversed(meses_c)), index=0)
+    base_100 = columna_c == "indice" and st.sidebar.checkbox("Rebasar a 100 en Desde")
+
+    datos = series_alineadas(tablas[columna_c], claves_c, desde_c, hasta_c, base_100)
+    if datos.empty:
+        st.warning("No hay datos para esta selección.")
+        return
+    st.plotly_chart(preparar(figura_comparacion(datos, columna_c, base_100), liviano),
+                    use_container_width=True, key="comparacion")
+
+
+# === MAPA DE CALOR ===
+def modo_calor(version, origenes_datos, liviano):
+    st.header("🌡️ Mapa de calor")
+    origenes_h = [o for o in origenes_datos if "variacion_mensual" in INDICADORES.get(o, [])]
+    origen_h = st.sidebar.selectbox("Origen", origenes_h)
+    _, indice, tablas, _ = datos_de(version, origenes_datos, origen_h)
+    columna_h = st.sidebar.selectbox("Color", [c for c in ("variacion_mensual", "variacion_interanual") if c in tablas],
+                                     format_func=METRICAS_MAESTRO.get)
+    eje_h = st.sidebar.radio("Filas", [EJE_CATEGORIA, EJE_REGION])
+    regiones_h = indice["regiones"].get(origen_h, [])
+    if eje_h == EJE_CATEGORIA:
+        fijo_h = st.sidebar.selectbox("Región", regiones_h,
+                                      index=regiones_h.index(REGION_NACIONAL) if REGION_NACIONAL in regiones_h else 0)
+    else:
+        categorias_h = sorted({c for r in regiones_h for c in indice["categorias"].get((origen_h, r), [])})
+        fijo_h = st.sidebar.selectbox("Categoría", categorias_h,
+                                      index=categorias_h.index("Nivel general") if "Nivel general" in categorias_h else 0)
+
+    matriz_h = cargar_pivote(version, origen_h, columna_h, eje_h, fijo_h)
+    if matriz_h.empty or not len(matriz_h.columns):
+        st.warning("No hay datos para esta selección.")
+        return
+    meses_h = list(matriz_h.columns)
+    desde_h = st.sidebar.selectbox("Desde", meses_h, index=max(len(meses_h) - 24, 0))
+    hasta_h = st.sidebar.selectbox("Hasta", list(reversed(meses_h)), index=0)
+    if desde_h > hasta_h:
+        st.warning("'Desde' es posterior a 'Hasta'.")
+        return
+
+    fig = obtener_figura(
+        (version, "calor", origen_h, fijo_h, eje_h, columna_h, desde_h, hasta_h),
+        lambda: figura_mapa_calor(matriz_h.loc[:, desde_h:hasta_h], columna_h,
+                                  f"{METRICAS_MAESTRO[columna_h]} – {fijo_h} ({desde_h} → {hasta_h})"),
+    )
+    st.plotly_chart(fig, use_container_width=True, key="mapa_calor")
+
+
+# === RANKING DE CATEGORÍAS ===
+def modo_ranking(version, origenes_datos, liviano):
+    st.header("🏆 Ranking de categorías")
+    _, indice, tablas, _ = datos_de(version, origenes_datos, ORIGEN_METRICAS)
+    nombres_r = {**METRICAS_MAESTRO, **METRICAS}
+    metrica_r = st.sidebar.selectbox("Métrica", [m for m in nombres_r if m in tablas], format_func=nombres_r.get)
+    regiones_r = indice["regiones"].get(ORIGEN_METRICAS, [])
+    region_r = st.sidebar.selectbox("Región", regiones_r,
+                                    index=regiones_r.index(REGION_NACIONAL) if REGION_NACIONAL in regiones_r else 0)
+    meses_r = meses_ranking(tablas[metrica_r], region_r)
+    if not meses_r:
+        st.warning("No hay datos de esta métrica para la región.")
+        return
+    mes_r = st.sidebar.selectbox("Mes", list(reversed(meses_r)), index=0)
+    cuadro_r = st.sidebar.selectbox("Categorías", ["Todas"] + list(cargar_ponderaciones()["cuadro"].unique()))
+    categorias_r = None if cuadro_r == "Todas" else list(pesos_cuadro(cuadro_r).index)
+
+    ranking = ranking_metrica(tablas[metrica_r], mes_r, region_r, categorias_r)
+    if ranking.empty:
+        st.warning("No hay categorías con dato para esta selección.")
+        return
+    n_r = st.sidebar.slider("Categorías en el ranking", 1, len(ranking), min(20, len(ranking)))
+    st.plotly_chart(
+        figura_ranking_metrica(ranking.head(n_r), metrica_r, f"{nombres_r[metrica_r]} – {region_r} ({mes_r})"),
+        use_container_width=True, key="ranking_metrica",
+    )
+    st.dataframe(ranking, use_container_width=True, hide_index=True)
+
+
+# === PRECIOS PROMEDIO ===
+def modo_precios(version, origenes_datos, liviano):
+    st.header("🛒 Precios promedio por producto")
+    cubo = datos_de(version, origenes_datos, ORIGEN_PRECIOS)[3] if ORIGEN_PRECIOS in origenes_datos else None
+    meses_p = meses_cubo(cubo) if cubo is not None else []
+    if not meses_p:
+        st.warning("No hay precios promedio cargados.")
+        return
+
+    regiones_p = st.sidebar.multiselect("Regiones", cubo["regiones"],
+                                        default=["GBA"] if "GBA" in cubo["regiones"] else cubo["regiones"][:1])
+    productos_p = st.sidebar.multiselect("Productos", cubo["productos"], default=cubo["productos"][:5])
+    desde_p = st.sidebar.selectbox("Desde", meses_p, index=max(len(meses_p) - 13, 0))
+    hasta_p = st.sidebar.selectbox("Hasta", list(reversed(meses_p)), index=0)
+    desde_p, hasta_p = sorted([desde_p, hasta_p])
+
+    if regiones_p and productos_p:
+        figura = figura_precios(serie_precios(cubo, productos_p, regiones_p, desde_p, hasta_p))
+        st.plotly_chart(preparar(figura, liviano), use_container_width=True, key="precios")
+        st.subheader(f"Variación {desde_p} → {hasta_p}")
+        st.dataframe(variacion_precios(cubo, desde_p, hasta_p, productos_p, regiones_p), use_container_width=True)
+    else:
+        st.info("Elegí al menos una región y un producto para comparar.")
+
+    region_ranking = st.sidebar.selectbox("Región del ranking", cubo["regiones"],
+                                          index=cubo["regiones"].index(regiones_p[0]) if regiones_p else 0)
+    n_ranking = st.sidebar.slider("Productos en el ranking", 5, len(cubo["productos"]), min(20, len(cubo["productos"])))
+    ranking = ranking_precios(cubo, desde_p, hasta_p, region_ranking, n_ranking)
+    if ranking.empty:
+        st.warning("No hay precios en ambos meses para la región del ranking.")
+    else:
+        st.plotly_chart(figura_ranking_precios(ranking, region_ranking, desde_p, hasta_p),
+                        use_container_width=True, key="ranking_precios")
+
+
+# === ÍNDICES COMPUESTOS ===
+def modo_compuestos(version, origenes_datos, liviano):
+    st.header("🧺 Índices compuestos según ponderaciones del IPC")
+    st.write(
+        "Cada región se arma como suma ponderada de los índices de sus categorías. "
+        "Editá los pesos o quitá categorías para comparar canastas alternativas."
+    )
+    cuadro = st.sidebar.selectbox("Ponderaciones", [CUADRO_DIVISIONES, "Principales aperturas"])
+    pesos_base = pesos_cuadro(cuadro)
+    regiones_c = st.sidebar.multiselect("Regiones", list(pesos_base.columns), default=[REGION_NACIONAL])
+    categorias_c = st.sidebar.multiselect("Categorías", list(pesos_base.index), default=list(pesos_base.index))
+    columna_c = st.sidebar.selectbox("Indicador a graficar", INDICADORES["variaciones"])
+    if not regiones_c or not categorias_c:
+        st.info("Elegí al menos una región y una categoría.")
+        return
+
+    pesos = st.data_editor(pesos_base.loc[categorias_c, regiones_c], use_container_width=True)
+    df, indice, tablas, _ = datos_de(version, origenes_datos, "variaciones")
+    compuestos = indices_compuestos_cacheados(tablas["indice"], pesos)
+    oficiales = [obtener_serie(df, indice, "variaciones", r, "Nivel general") for r in regiones_c
+                 if ("variaciones", r, "Nivel general") in indice["series"]]
+    referencia = pd.concat(oficiales) if oficiales else None
+    st.plotly_chart(preparar(figura_compuestos(compuestos, columna_c, referencia), liviano),
+                    use_container_width=True, key="compuestos")
+
+
+# === ACTUALIZACIÓN MASIVA DE MONTOS ===
+def modo_masivo(version, origenes_datos, liviano):
+    st.header("💵 Actualización masiva de montos según IPC")
+    st.write(
+        "Subí un CSV con las columnas `region`, `categoria`, `desde`, `hasta` (AAAA-MM) y `monto`; "
+        "opcionalmente `origen` (por defecto `variaciones`) y `monto_final` para calcular la ganancia o pérdida real."
+    )
+    archivo = st.file_uploader("Archivo de montos", type=["csv"])
+    if archivo is None:
+        return
+
+    with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp:
+        ruta_salida = tmp.name
+    try:
+        totales = actualizar_archivo(datos_de(version, origenes_datos, "variaciones")[2]["indice"], archivo, ruta_salida)
+        with open(ruta_salida, "rb") as f:
+            resultado_csv = f.read()
+    except ValueError as e:
+        st.error(str(e))
+        return
+    finally:
+        os.remove(ruta_salida)
+
+    st.write(f"**Filas procesadas:** {totales['filas']:,}")
+    st.write(f"**Filas sin índice para la serie o los meses indicados:** {totales['sin_indice']:,}")
+    st.write(f"**Filas con monto nulo, cero o negativo:** {totales['monto_invalido']:,}")
+    st.write(f"**Total original:** ${totales['monto']:,.2f}")
+    st.write(f"**Total actualizado:** ${totales['monto_actualizado']:,.2f}")
+    st.dataframe(pd.read_csv(io.BytesIO(resultado_csv), nrows=100))
+    st.download_button("⬇ Descargar montos actualizados", resultado_csv,
+                       file_name="montos_actualizados.csv", mime="text/csv")
+
+
+# === GRÁFICOS POR SERIE ===
+def modo_graficos(version, origenes_datos, liviano):
+    st.sidebar.header("Filtros")
+
+    # --- Filtros principales ---
+    origenes = [o for o in origenes_datos if o != ORIGEN_PRECIOS]
+    origen = st.sidebar.selectbox("Origen", origenes if origenes else ["variaciones"])
+    df, indice, tablas, _ = datos_de(version, origenes_datos, origen)
+
+    indicadores_disponibles = INDICADORES.get(origen, [])
+    if not indicadores_disponibles:
+        st.warning("Este origen no tiene indicadores configurados.")
+        return
+
+    columna = st.sidebar.selectbox("Indicador a graficar", indicadores_disponibles)
+
+    # --- Región ---
+    regiones = indice["regiones"].get(origen, [])
+    if "Región Nacional" in regiones:
+        idx_region = regiones.index("Región Nacional")
+    elif "Región GBA" in regiones:
+        idx_region = regiones.index("Región GBA")
+    else:
+        idx_region = 0
+    region = st.sidebar.selectbox("Región", regiones, index=idx_region)
+
+    # --- Categoría ---
+    categorias = indice["categorias"].get((origen, region), [])
+    idx_categoria = categorias.index("Nivel general") if "Nivel general" in categorias else 0
+    categoria = st.sidebar.selectbox("Categoría", categorias, index=idx_categoria)
+
+    grafico = st.sidebar.radio(
+        "Tipo de gráfico",
+        TIPOS_GRAFICO
+    )
+
+    # --- Preparar selectores de fechas (siempre visibles) ---
+    fechas_selector_definidas = False
+    seleccion = {}
+
+    if grafico == "Serie temporal":
+        base_filtros = obtener_serie(df, indice, origen, region, categoria).dropna(subset=[columna])
+
+        meta_fechas = fechas_serie(version, tablas, columna, (origen, region, categoria))
+        fechas_str_asc = meta_fechas["fechas"]
+        if len(fechas_str_asc) > 0:
+            if columna == "variacion_interanual":
+                desde_str = st.sidebar.selectbox("Desde", fechas_str_asc, index=0)
+                mes_ref = int(desde_str[5:7])
+                anio_desde = int(desde_str[:4])
+
+                fechas_hasta = hasta_interanual(meta_fechas, desde_str)
+                if len(fechas_hasta) == 0:
+                    fechas_hasta = [SIN_OPCIONES]
+                    hasta_str = st.sidebar.selectbox("Hasta", fechas_hasta, index=0)
+                else:
+                    hasta_str = st.sidebar.selectbox("Hasta", fechas_hasta, index=len(fechas_hasta) - 1)
+
+                seleccion.update({
+                    "fechas_str_asc": fechas_str_asc,
+                    "desde_str": desde_str,
+                    "hasta_str": hasta_str,
+                    "mes_ref": mes_ref,
+                    "anio_desde": anio_desde
+                })
+                fechas_selector_definidas = True
+
+            else:
+                fechas_str_desc = meta_fechas["fechas_desc"]
+                desde_str = st.sidebar.selectbox("Desde", fechas_str_asc, index=0)
+                hasta_str = st.sidebar.selectbox("Hasta", fechas_str_desc, index=0)
+                seleccion.update({
+                    "fechas_str_asc": fechas_str_asc,
+                    "fechas_str_desc": fechas_str_desc,
+                    "desde_str": desde_str,
+                    "hasta_str": hasta_str
+                })
+                fechas_selector_definidas = True
+
+    elif grafico == "Acumulado entre fechas":
+        base_filtros = obtener_serie(df, indice, origen, region, categoria).dropna(subset=["indice"])
+
+        meta_fechas = fechas_serie(version, tablas, "indice", (origen, region, categoria))
+        fechas_str_asc = meta_fechas["fechas"]
+        if len(fechas_str_asc) > 0:
+            fechas_str_desc = meta_fechas["fechas_desc"]
+            desde_str = st.sidebar.selectbox("Desde", fechas_str_asc, index=0)
+            hasta_str = st.sidebar.selectbox("Hasta", fechas_str_desc, index=0)
+            seleccion.update({
+                "fechas_str_asc": fechas_str_asc,
+                "fechas_str_desc": fechas_str_desc,
+                "desde_str": desde_str,
+                "hasta_str": hasta_str
+            })
+            fechas_selector_definidas = True
+
+    # --- Botón de ejecución ---
+    ejecutar = st.sidebar.button("▶ Ejecutar")
+
+    st.header(f"{grafico} – {categoria} / {region} / {columna} ({origen})")
+
+    # Si no se presionó el botón, no se genera gráfico
+    if not ejecutar:
+        st.info("Seleccione los filtros y presione **Ejecutar** para generar el gráfico.")
+        return
+
+    # Si se presiona, validamos que haya fechas
+    if not fechas_selector_definidas:
+        st.warning("No hay datos disponibles para construir los selectores de fechas con la combinación elegida.")
+        return
+
+    # === SERIE TEMPORAL ===
+    if grafico == "Serie temporal":
+        base = base_filtros
+
+        if columna == "variacion_interanual" and seleccion["hasta_str"] == SIN_OPCIONES:
+            st.warning("No hay años posteriores con el mismo mes para la selección indicada.")
+            return
+
+        datos = datos_serie_temporal(base, columna, seleccion["desde_str"], seleccion["hasta_str"])
+
+        if datos.empty:
+            st.warning("No hay datos para esta selección.")
+        else:
+            clave = clave_figura(grafico, origen, region, categoria, columna,
+                                 seleccion["desde_str"], seleccion["hasta_str"], version, liviano)
+            fig = obtener_figura(
+                clave, lambda: preparar(figura_serie_temporal(datos, columna, categoria, region, origen), liviano)
+            )
+            st.plotly_chart(fig, use_container_width=True, key=f"serie_temporal_{region}_{categoria}_{columna}")
+
+    # === ACUMULADO ENTRE FECHAS ===
+    elif grafico == "Acumulado entre fechas":
+        base = base_filtros
+
+        desde_str, hasta_str = sorted([seleccion["desde_str"], seleccion["hasta_str"]])
+        acumulado = inflacion_acumulada(tablas["indice"], origen, region, categoria, desde_str, hasta_str)
+
+        if acumulado is None:
+            st.warning("No se encontraron índices para las fechas seleccionadas.")
+            return
+
+        valor_a, valor_b, inflacion_acum = acumulado
+
+        st.subheader("📈 Cálculo de inflación acumulada")
+        st.write(f"**Período:** {seleccion['desde_str']} → {seleccion['hasta_str']}")
+        st.write(f"**Índice inicial:** {valor_a:.3f}")
+        st.write(f"**Índice final:** {valor_b:.3f}")
+        st.write(f"**Inflación acumulada:** {inflacion_acum:.2f} %")
+
+        monto = st.number_input("💰 Ingresá un monto en pesos del período inicial",
+                                min_value=0.0, value=0.0, step=100.0)
+        monto_final = st.number_input("💰 Ingresá un monto en pesos del período final (opcional)",
+                                      min_value=0.0, value=0.0, step=100.0)
+
+        if monto > 0:
+            monto_actualizado = monto * (valor_b / valor_a)
+            st.write("---")
+            st.subheader("💵 Actualización de monto según IPC")
+            st.write(f"Monto original ({seleccion['desde_str']}): **${monto:,.2f}**")
+            st.write(f"Monto actualizado ({seleccion['hasta_str']}): **${monto_actualizado:,.2f}**")
+
+            if monto_final > 0:
+                diferencia_pesos = monto_final - monto_actualizado
+                diferencia_pct = (monto_final / monto_actualizado - 1) * 100
+                resultado = "Ganancia real" if diferencia_pesos > 0 else "Pérdida real"
+                color = "green" if diferencia_pesos > 0 else "red"
+                st.write("---")
+                st.markdown(
+                    f"<h4 style='color:{color}'>📊 {resultado}: ${diferencia_pesos:,.2f} ({diferencia_pct:+.2f} %)</h4>",
+                    unsafe_allow_html=True
+                )
+
+        clave = clave_figura(grafico, origen, region, categoria, "indice",
+                             seleccion["desde_str"], seleccion["hasta_str"], version, liviano)
+        fig = obtener_figura(
+            clave,
+            lambda: preparar(
+                figura_acumulado(tramo_acumulado(base, desde_str, hasta_str, valor_a), categoria, region, origen),
+                liviano,
+            )
+        )
+        st.plotly_chart(fig, use_container_width=True, key="acumulado")
+
+
+MODOS = {
+    MODO_GRAFICOS: modo_graficos,
+    MODO_COMPARAR: modo_comparar,
+    MODO_RANKING: modo_ranking,
+    MODO_CALOR: modo_calor,
+    MODO_COMPUESTOS: modo_compuestos,
+    MODO_PRECIOS: modo_precios,
+    MODO_MASIVO: modo_masivo,
+}
+
+
+def main():
+    """Un rerun de la app."""
+    st.set_page_config(page_title="Reportes IPC – Plotly", layout="wide")
+    version = version_maestro()
+    origenes_datos = cargar_origenes(version)
+
+    modo = st.sidebar.radio("Modo", list(MODOS))
+    liviano = st.sidebar.toggle("Render liviano", value=True,
+                                help="Reduce puntos y rótulos y usa WebGL cuando la figura es grande.")
+    lugar_calidad = st.sidebar.container()
+    MODOS[modo](version, origenes_datos, liviano)
+    panel_calidad(version, lugar_calidad)
@@ -0,0 +1,171 @@
+"""Chequeos de calidad del maestro, vectorizados para correr en cada carga y en cada delta.
+
+    python -m ipc.calidad                  # resumen del maestro
+    python -m ipc.calidad delta.csv --csv reporte.csv
+
+Cada chequeo devuelve filas de un reporte común (``COLUMNAS_REPORTE``)
+con su severidad: los errores dejan datos ambiguos o inválidos; los
+avisos marcan datos que se pueden usar pero conviene revisar (p. ej. un
+mes en que falta una región y la "Región Nacional" sale de las demás).
+Las filas de "Región Nacional" se calculan, así que no se revisan. Los
+chequeos que necesitan columnas ausentes (p. ej. ``indice`` en los
+datos de un origen de precios) se omiten.
+"""
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from .agregacion import CLAVES_NACIONAL, REGION_NACIONAL
+from .datos import CSV_MAESTRO, leer_maestro
+from .ponderaciones import pesos_regionales
+
+COLUMNAS_REPORTE = ["chequeo", "severidad", "origen", "region", "categoria", "fecha", "detalle"]
+SEVERIDADES = {
+    "fecha_invalida": "error",
+    "duplicada": "error",
+    "unidad_repetida": "aviso",
+    "region_faltante": "aviso",
+    "hueco": "aviso",
+    "variacion_inconsistente": "aviso",
+}
+
+CLAVES_DUPLICADOS = ["categoria", "region", "fecha", "origen"]
+# Una serie se distingue también por la unidad (precios en varias presentaciones).
+CLAVES_SERIE_CALIDAD = ["origen", "region", "categoria", "unidad_medida"]
+# La variación publicada viene redondeada a un decimal.
+TOLERANCIA_VARIACION = 0.15
+
+
+def _reporte(chequeo, filas, detalle):
+    """Filas del reporte para ``chequeo`` a partir de las claves en ``filas``."""
+    rep = pd.DataFrame({c: filas[c].to_numpy() if c in filas else None for c in ["origen", "region", "categoria", "fecha"]})
+    rep.insert(0, "severidad", SEVERIDADES[chequeo])
+    rep.insert(0, "chequeo", chequeo)
+    rep["detalle"] = detalle
+    return rep[COLUMNAS_REPORTE]
+
+
+def chequear_fechas(df):
+    """Filas cuya ``fecha`` quedó nula al interpretarla (``errors="coerce"``)."""
+    invalidas = df[df["fecha"].isna()]
+    return _reporte("fecha_invalida", invalidas, "fecha nula o con formato no reconocido")
+
+
+def chequear_duplicados(df):
+    """Claves (categoria, region, fecha, origen) repetidas.
+
+    Es error si también coincide ``unidad_medida``; si no, un aviso: el
+    mismo producto relevado en dos presentaciones.
+    """
+    repetidas = df[df.duplicated(CLAVES_DUPLICADOS, keep=False)]
+    exactas = repetidas.duplicated([c for c in CLAVES_DUPLICADOS + ["unidad_medida"] if c in df], keep=False).to_numpy()
+    partes = []
+    for chequeo, mascara in (("duplicada", exactas), ("unidad_repetida", ~exactas)):
+        filas = repetidas[mascara]
+        conteo = filas.groupby(CLAVES_DUPLICADOS, observed=True, dropna=False).size().reset_index(name="n")
+        partes.append(_reporte(chequeo, conteo, conteo["n"].map(lambda n: f"{n} filas con la misma clave")))
+    return pd.concat(partes, ignore_index=True)
+
+
+def chequear_regiones(df, pesos=None):
+    """Meses en que una categoría no tiene índice en todas las regiones del promedio nacional."""
+    regiones = list(pesos_regionales() if pesos is None else pesos)
+    base = df[df["region"].isin(regiones) & df["indice"].notna() & df["fecha"].notna()]
+    grupo = base.groupby(CLAVES_NACIONAL, observed=True, sort=False).ngroup().to_numpy()
+    region = pd.Categorical(base["region"], categories=regiones).codes
+
+    presentes = np.zeros((grupo.max() + 1 if len(grupo) else 0, len(regiones)), dtype=bool)
+    presentes[grupo, region] = True
+    incompletos = np.flatnonzero(~presentes.all(axis=1))
+
+    primera = pd.Series(np.arange(len(base))).groupby(grupo).first().to_numpy()
+    filas = base.iloc[primera[incompletos]]
+    nombres = np.array(regiones, dtype=object)
+    detalle = [
+        f"faltan {', '.join(nombres[~presentes[g]])}: el índice nacional sale de {presentes[g].sum()} de {len(regiones)} regiones"
+        for g in incompletos
+    ]
+    return _reporte("region_faltante", filas.assign(region=None), detalle)
+
+
+def _ordenar_series(df):
+    """``df`` ordenado por serie y fecha, con el id de serie y el mes absoluto de cada fila."""
+    claves = [c for c in CLAVES_SERIE_CALIDAD if c in df]
+    serie = df.groupby(claves, observed=True, dropna=False, sort=False).ngroup().to_numpy()
+    meses = df["fecha"].to_numpy().astype("datetime64[M]").astype("int64")
+    orden = np.lexsort((meses, serie))
+    return df.iloc[orden], serie[orden], meses[orden]
+
+
+def chequear_huecos(df):
+    """Meses salteados dentro de cada serie mensual."""
+    df = df[df["fecha"].notna()]
+    ordenado, serie, meses = _ordenar_series(df)
+    salto = np.diff(meses)
+    hueco = np.flatnonzero((serie[1:] == serie[:-1]) & (salto > 1))
+
+    filas = ordenado.iloc[hueco + 1]
+    desde = (meses[hueco] + 1).astype("datetime64[M]")
+    hasta = (meses[hueco + 1] - 1).astype("datetime64[M]")
+    detalle = [
+        f"falta 1 mes ({d})" if n == 1 else f"faltan {n} meses ({d} a {h})"
+        for n, d, h in zip(salto[hueco] - 1, desde.astype(str), hasta.astype(str))
+    ]
+    return _reporte("hueco", filas.assign(fecha=desde.astype("datetime64[ns]")), detalle)
+
+
+def chequear_variaciones(df, tolerancia=TOLERANCIA_VARIACION):
+    """Meses en que ``variacion_mensual`` no coincide con el cambio del ``indice`` respecto del mes anterior."""
+    df = df[df["fecha"].notna()]
+    ordenado, serie, meses = _ordenar_series(df)
+    indice = ordenado["indice"].to_numpy(dtype="float64")
+    publicada = ordenado["variacion_mensual"].to_numpy(dtype="float64")[1:]
+
+    consecutivo = (serie[1:] == serie[:-1]) & (np.diff(meses) == 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        calculada = (indice[1:] / indice[:-1] - 1) * 100
+    distinta = consecutivo & (np.abs(calculada - publicada) > tolerancia)
+    pos = np.flatnonzero(distinta)
+
+    detalle = [f"publicada {p:.2f}% vs. índice {c:.2f}%" for p, c in zip(publicada[pos], calculada[pos])]
+    return _reporte("variacion_inconsistente", ordenado.iloc[pos + 1], detalle)
+
+
+def validar(df, pesos=None, tolerancia=TOLERANCIA_VARIACION):
+    """Reporte de calidad de ``df`` (maestro o delta) con todos los chequeos."""
+    df = df[df["region"] != REGION_NACIONAL]
+    con_indice = "indice" in df
+    return pd.concat([
+        chequear_fechas(df),
+        chequear_duplicados(df),
+        chequear_regiones(df, pesos) if con_indice else None,
+        chequear_huecos(df),
+        chequear_variaciones(df, tolerancia) if con_indice and "variacion_mensual" in df else None,
+    ], ignore_index=True)
+
+
+def resumen(reporte):
+    """Cantidad de hallazgos por chequeo y severidad."""
+    return reporte.groupby(["severidad", "chequeo"]).size().rename("hallazgos").reset_index()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chequeos de calidad del maestro del IPC.")
+    parser.add_argument("csv", nargs="?", default=CSV_MAESTRO, help="Maestro o delta a revisar.")
+    parser.add_argument("--csv", dest="salida", help="Guardar el reporte completo en este CSV.")
+    args = parser.parse_args()
+
+    reporte = validar(leer_maestro(args.csv))
+    if reporte.empty:
+        print("Sin hallazgos.")
+    else:
+        print(resumen(reporte).to_string(index=False))
+    if args.salida:
+        reporte.to_csv(args.salida, index=False)
+    sys.exit(1 if (reporte["severidad"] == "error").any() else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""Consultas de inflación acumulada y actualización de montos en O(1).
+
+El índice de todas las series se vuelca una vez en una matriz densa
+serie × mes. Una consulta es un acceso por posición: la fila sale de un
+dict por serie y la columna de aritmética sobre el mes, sin recorrer ni
+copiar el frame.
+"""
+import hashlib
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+CLAVES_PEDIDO = ["origen", "region", "categoria"]
+
+# --- Archivos de montos ---
+COLUMNAS_ARCHIVO = ["region", "categoria", "desde", "hasta", "monto"]
+ORIGEN_POR_DEFECTO = "variaciones"
+TAMANO_BLOQUE = 200_000
+
+
+def mes_absoluto(fecha):
+    """Meses desde 1970-01 para un texto ``%Y-%m`` o una fecha."""
+    if isinstance(fecha, str):
+        return (int(fecha[:4]) - 1970) * 12 + int(fecha[5:7]) - 1
+    return int(np.datetime64(fecha, "M").astype("int64"))
+
+
+def _meses_absolutos(fechas):
+    """Versión vectorizada de ``mes_absoluto``; ``-1`` donde no hay fecha válida."""
+    fechas = pd.to_datetime(pd.Series(fechas).astype(str).str[:7], format="%Y-%m", errors="coerce")
+    meses = fechas.to_numpy().astype("datetime64[M]").astype("int64")
+    return np.where(fechas.isna().to_numpy(), -1, meses)
+
+
+def construir_tabla(df, indice, columna="indice"):
+    """Matriz serie × mes de ``columna`` a partir del frame indexado por ``indexar_series``."""
+    # Los tramos de ``indexar_series`` son contiguos y cubren todo ``df`` en orden.
+    claves = list(indice["series"])
+    tramos = np.array([indice["series"][k] for k in claves], dtype=np.int64).reshape(-1, 2)
+    filas = np.repeat(np.arange(len(claves)), tramos[:, 1] - tramos[:, 0])
+
+    meses = df["fecha"].to_numpy().astype("datetime64[M]").astype("int64")
+    valores = df[columna].to_numpy(dtype="float64")
+    validos = ~np.isnan(valores) & (meses > np.iinfo(np.int64).min)
+
+    mes0 = int(meses[validos].min()) if validos.any() else 0
+    n_meses = int(meses[validos].max()) - mes0 + 1 if validos.any() else 0
+    matriz = np.full((len(claves), n_meses), np.nan)
+    matriz[filas[validos], meses[validos] - mes0] = valores[validos]
+
+    huella = hashlib.sha1(matriz.tobytes())
+    huella.update(repr((columna, mes0, claves)).encode())
+    return {
+        "columna": columna,
+        "huella": huella.hexdigest()[:16],
+        "valores": matriz,
+        "filas": {k: i for i, k in enumerate(claves)},
+        "series": pd.MultiIndex.from_tuples(claves, names=CLAVES_PEDIDO),
+        "mes0": mes0,
+    }
+
+
+def valor(tabla, origen, region, categoria, fecha):
+    """Valor de la serie en ``fecha`` (``%Y-%m``), o NaN si no está."""
+    fila = tabla["filas"].get((origen, region, categoria))
+    col = mes_absoluto(fecha) - tabla["mes0"]
+    if fila is None or not 0 <= col < tabla["valores"].shape[1]:
+        return np.nan
+    return tabla["valores"][fila, col]
+
+
+def inflacion_acumulada(tabla, origen, region, categoria, desde, hasta):
+    """``(valor_a, valor_b, inflacion_acum)`` entre ``desde`` y ``hasta``, o ``None`` si falta un extremo."""
+    valor_a = valor(tabla, origen, region, categoria, desde)
+    valor_b = valor(tabla, origen, region, categoria, hasta)
+    if np.isnan(valor_a) or np.isnan(valor_b):
+        return None
+    return valor_a, valor_b, (valor_b / valor_a - 1) * 100
+
+
+def actualizar_monto(tabla, origen, region, categoria, desde, hasta, monto):
+    """``monto`` de ``desde`` expresado en pesos de ``hasta`` (NaN si falta un extremo)."""
+    return monto * valor(tabla, origen, region, categoria, hasta) / valor(tabla, origen, region, categoria, desde)
+
+
+def _filas_series(tabla, claves):
+    """Fila de cada ``(origen, region, categoria)`` de ``claves`` en ``tabla`` (-1 si no está)."""
+    if not len(claves):
+        return np.array([], dtype=np.int64)
+    return tabla["series"].get_indexer(pd.MultiIndex.from_tuples(claves, names=CLAVES_PEDIDO))
+
+
+def meses_con_datos(tabla, claves):
+    """Meses (``%Y-%m``, ascendente) en los que alguna de las series de ``claves`` tiene valor."""
+    filas = _filas_series(tabla, claves)
+    filas = filas[filas >= 0]
+    con_datos = np.flatnonzero(~np.isnan(tabla["valores"][filas]).all(axis=0)) if len(filas) else []
+    return (np.asarray(con_datos, dtype=np.int64) + tabla["mes0"]).astype("datetime64[M]").astype(str).tolist()
+
+
+def pivote(tabla, claves, etiquetas=None):
+    """Matriz (frame) serie × mes de ``tabla`` para ``claves``, en un solo acceso.
+
+    Las filas se rotulan con ``etiquetas`` (por defecto la categoría de
+    cada clave) y las columnas con el mes (``%Y-%m``); las series que no
+    están en la tabla se omiten y los meses se recortan a los que tienen
+    algún valor.
+    """
+    etiquetas = [k[2] for k in claves] if etiquetas is None else list(etiquetas)
+    filas = _filas_series(tabla, claves)
+    presentes = filas >= 0
+    bloque = tabla["valores"][filas[presentes]]
+    con_datos = np.flatnonzero(~np.isnan(bloque).all(axis=0))
+    columnas = np.arange(con_datos[0], con_datos[-1] + 1) if len(con_datos) else np.array([], dtype=np.int64)
+    meses = (columnas + tabla["mes0"]).astype("datetime64[M]").astype(str)
+    return pd.DataFrame(
+        bloque[:, columnas],
+        index=pd.Index(np.array(etiquetas, dtype=object)[presentes], name="serie"),
+        columns=pd.Index(meses, name="fecha"),
+    )
+
+
+def series_alineadas(tabla, claves, desde, hasta, base_100=False):
+    """Varias series de ``tabla`` sobre un mismo eje mensual, en una sola consulta.
+
+    ``claves`` es una lista de ``(origen, region, categoria)``; las que no
+    están en la tabla se omiten. Con ``base_100`` cada serie se expresa
+    como 100 en ``desde`` (queda nula si no tiene valor ese mes). Devuelve
+    un frame largo con ``origen``, ``region``, ``categoria``, ``fecha`` y
+    la columna de la tabla, sin los meses nulos.
+    """
+    claves = [k for k, f in zip(claves, _filas_series(tabla, claves)) if f >= 0]
+    filas = _filas_series(tabla, claves)
+    n_meses = tabla["valores"].shape[1]
+    ini, fin = sorted([mes_absoluto(desde) - tabla["mes0"], mes_absoluto(hasta) - tabla["mes0"]])
+    ini, fin = max(ini, 0), min(fin, n_meses - 1)
+    columnas = np.arange(ini, fin + 1)
+
+    bloque = tabla["valores"][np.ix_(filas, columnas)]
+    if base_100:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bloque = bloque / bloque[:, :1] * 100
+
+    fechas = (columnas + tabla["mes0"]).astype("datetime64[M]").astype("datetime64[ns]")
+    claves_largas = np.array(claves, dtype=object).reshape(-1, 3).repeat(len(columnas), axis=0)
+    datos = pd.DataFrame({
+        "origen": claves_largas[:, 0],
+        "region": claves_largas[:, 1],
+        "categoria": claves_largas[:, 2],
+        "fecha": np.tile(fechas, len(claves)),
+        tabla["columna"]: bloque.ravel(),
+    })
+    return datos.dropna(subset=[tabla["columna"]]).reset_index(drop=True)
+
+
+def diferencia_real(monto_final, monto_actualizado):
+    """Ganancia (o pérdida) real de ``monto_final`` frente al monto actualizado: ``(pesos, pct)``."""
+    diferencia_pesos = monto_final - monto_actualizado
+    diferencia_pct = (monto_final / monto_actualizado - 1) * 100
+    return diferencia_pesos, diferencia_pct
+
+
+def actualizar_montos(tabla, pedidos):
+    """Versión por lotes de ``inflacion_acumulada`` y ``actualizar_monto``.
+
+    ``pedidos`` es un DataFrame con ``origen``, ``region``, ``categoria``,
+    ``desde``, ``hasta`` y ``monto``. Devuelve un DataFrame alineado con
+    ``valor_desde``, ``valor_hasta``, ``inflacion_acum`` y
+    ``monto_actualizado``; las filas sin serie o sin índice en alguno de
+    los meses quedan en NaN, y también el monto actualizado de las filas
+    con ``monto`` nulo o no positivo (como en la consulta individual). Si
+    ``pedidos`` trae ``monto_final`` se agregan ``diferencia_pesos`` y
+    ``diferencia_pct``.
+    """
+    filas = tabla["series"].get_indexer(pd.MultiIndex.from_frame(pedidos[CLAVES_PEDIDO].astype(object)))
+    n_meses = tabla["valores"].shape[1]
+
+    def tomar(fechas):
+        cols = _meses_absolutos(fechas) - tabla["mes0"]
+        ok = (filas >= 0) & (cols >= 0) & (cols < n_meses)
+        out = np.full(len(filas), np.nan)
+        out[ok] = tabla["valores"][filas[ok], cols[ok]]
+        return out
+
+    valor_desde = tomar(pedidos["desde"])
+    valor_hasta = tomar(pedidos["hasta"])
+    factor = valor_hasta / valor_desde
+    monto = pedidos["monto"].to_numpy(dtype="float64")
+    resultado = pd.DataFrame(
+        {
+            "valor_desde": valor_desde,
+            "valor_hasta": valor_hasta,
+            "inflacion_acum": (factor - 1) * 100,
+            "monto_actualizado": np.where(monto > 0, monto * factor, np.nan),
+        },
+        index=pedidos.index,
+    )
+    if "monto_final" in pedidos:
+        resultado["diferencia_pesos"], resultado["diferencia_pct"] = diferencia_real(
+            pedidos["monto_final"].to_numpy(dtype="float64"), resultado["monto_actualizado"].to_numpy()
+        )
+    return resultado
+
+
+def actualizar_archivo(tabla, entrada, salida, tamano_bloque=TAMANO_BLOQUE):
+    """Actualiza un CSV de montos por bloques, sin cargarlo entero en memoria.
+
+    ``entrada`` (ruta o archivo abierto) debe traer ``COLUMNAS_ARCHIVO``;
+    ``origen`` es opcional (por defecto ``ORIGEN_POR_DEFECTO``) y
+    ``monto_final`` también. En la ruta ``salida`` se escriben las
+    columnas de entrada más las de ``actualizar_montos``. Devuelve un
+    resumen con filas procesadas, filas sin índice, filas con ``monto``
+    nulo o no positivo y totales de montos (sólo de las filas calculadas).
+    """
+    resumen = {"filas": 0, "sin_indice": 0, "monto_invalido": 0, "monto": 0.0, "monto_actualizado": 0.0}
+    bloques = pd.read_csv(entrada, chunksize=tamano_bloque, dtype={"desde": str, "hasta": str})
+    escritor = esquema = None
+    try:
+        for bloque in bloques:
+            faltantes = [c for c in COLUMNAS_ARCHIVO if c not in bloque]
+            if faltantes:
+                raise ValueError(f"Faltan columnas en el archivo: {faltantes}")
+            if "origen" not in bloque:
+                bloque.insert(0, "origen", ORIGEN_POR_DEFECTO)
+            bloque = bloque.astype({c: "float64" for c in ("monto", "monto_final") if c in bloque})
+
+            resultado = pd.concat([bloque, actualizar_montos(tabla, bloque)], axis=1)
+            # El escritor CSV de Arrow es un orden de magnitud más rápido que
+            # ``to_csv`` formateando floats.
+            lote = pa.Table.from_pandas(resultado, schema=esquema, preserve_index=False)
+            if escritor is None:
+                esquema = lote.schema
+                escritor = pa_csv.CSVWriter(salida, esquema)
+            escritor.write_table(lote)
+
+            sin_indice = resultado["inflacion_acum"].isna()
+            calculadas = resultado["monto_actualizado"].notna()
+            resumen["filas"] += len(resultado)
+            resumen["sin_indice"] += int(sin_indice.sum())
+            resumen["monto_invalido"] += int((~sin_indice & ~calculadas).sum())
+            resumen["monto"] += float(resultado.loc[calculadas, "monto"].sum())
+            resumen["monto_actualizado"] += float(resultado["monto_actualizado"].sum())
+    finally:
+        if escritor is not None:
+            escritor.close()
+    return resumen
@@ -0,0 +1,246 @@
+import glob
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+
+from .agregacion import agregar_nacional
+from .ponderaciones import pesos_regionales
+
+# Los CSV y la caché viven en la raíz del repo, fuera del paquete.
+DIR_DATOS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CSV_MAESTRO = os.path.join(DIR_DATOS, "ipc_maestro_sin_ponderaciones.csv")
+
+# --- Caché columnar en disco ---
+# Se invalida sola: el nombre del archivo lleva la huella de los CSV de
+# origen, los pesos regionales y la versión del preprocesamiento.
+DIR_CACHE = os.environ.get("IPC_CACHE_DIR", os.path.join(DIR_DATOS, ".cache_ipc"))
+VERSION_CACHE = 2
+
+# --- Esquema de tipos del maestro ---
+# Columnas de texto de baja cardinalidad: se guardan como categóricas con
+# las categorías ordenadas, así el orden de ``sort_values`` coincide con
+# el de ``sorted``.
+COLUMNAS_CATEGORICAS = ["categoria", "region", "origen", "unidad_medida"]
+# Columnas numéricas que se bajan a float32 sólo si la conversión es exacta.
+COLUMNAS_NUMERICAS = ["variacion_mensual", "variacion_interanual", "indice", "precio_promedio"]
+
+
+# --- Columnas por origen ---
+# Cada origen usa sólo algunas columnas del maestro; las demás vienen
+# vacías en sus filas y no hace falta leerlas.
+COLUMNAS_INDICES = ["categoria", "region", "fecha", "variacion_mensual", "variacion_interanual", "indice", "origen"]
+COLUMNAS_ORIGEN = {
+    "precios_promedio": ["categoria", "region", "fecha", "origen", "unidad_medida", "precio_promedio"],
+}
+
+
+def columnas_origen(origen):
+    """Columnas del maestro que usa ``origen``."""
+    return COLUMNAS_ORIGEN.get(origen, COLUMNAS_INDICES)
+
+
+def leer_maestro(ruta=CSV_MAESTRO, columnas=None):
+    """Lee el CSV maestro (sólo ``columnas``, si se indican) y normaliza ``fecha`` al primer día del mes."""
+    df = pd.read_csv(ruta, usecols=columnas)
+    df["fecha"] = pd.to_datetime(df["fecha"].astype(str).str[:7], errors="coerce")
+    return df
+
+
+def aplicar_esquema(df):
+    """Convierte ``df`` a los tipos compactos del esquema del maestro."""
+    df = df.copy()
+    for col in COLUMNAS_CATEGORICAS:
+        if col in df:
+            valores = df[col]
+            if isinstance(valores.dtype, pd.CategoricalDtype):
+                # Una parte de un maestro ya categórico (p. ej. un origen) arrastra categorías de las demás.
+                valores = valores.cat.remove_unused_categories()
+            categorias = sorted(valores.dropna().unique())
+            df[col] = pd.Categorical(valores, categories=categorias)
+    for col in COLUMNAS_NUMERICAS:
+        if col in df:
+            valores = df[col].to_numpy(dtype="float64")
+            angosto = valores.astype("float32")
+            if np.array_equal(angosto.astype("float64"), valores, equal_nan=True):
+                df[col] = angosto
+    return df
+
+
+def memoria(df):
+    """Bytes ocupados por ``df``, por columna y total."""
+    por_columna = df.memory_usage(deep=True, index=False)
+    return por_columna.to_dict(), int(por_columna.sum())
+
+
+def huella(rutas, pesos):
+    """Hash del contenido de ``rutas`` y de los ``pesos`` usados para agregar."""
+    h = hashlib.sha256(f"v{VERSION_CACHE}".encode())
+    for ruta in rutas:
+        with open(ruta, "rb") as f:
+            for bloque in iter(lambda: f.read(1 << 20), b""):
+                h.update(bloque)
+    h.update(json.dumps(pesos, sort_keys=True).encode())
+    return h.hexdigest()[:16]
+
+
+def version_maestro(ruta=CSV_MAESTRO):
+    """Marca barata (mtime y tamaño) para detectar que el CSV cambió en disco."""
+    st = os.stat(ruta)
+    return f"{st.st_mtime_ns}-{st.st_size}"
+
+
+def _ruta_cache(nombre, clave, dir_cache):
+    return os.path.join(dir_cache, f"{nombre}_{clave}.feather")
+
+
+def leer_cache(nombre, clave, dir_cache=DIR_CACHE):
+    """Devuelve el frame cacheado para ``clave`` o ``None`` si no existe."""
+    ruta = _ruta_cache(nombre, clave, dir_cache)
+    if not os.path.exists(ruta):
+        return None
+    # Sin compresión el archivo se mapea en memoria y no se parsea nada.
+    return feather.read_table(ruta, memory_map=True).to_pandas()
+
+
+def escribir_cache(df, nombre, clave, dir_cache=DIR_CACHE):
+    """Persiste ``df`` para ``clave`` y borra las versiones anteriores de ``nombre``."""
+    ruta = _ruta_cache(nombre, clave, dir_cache)
+    try:
+        os.makedirs(dir_cache, exist_ok=True)
+        tmp = f"{ruta}.{os.getpid()}.tmp"
+        feather.write_feather(df, tmp, compression="uncompressed")
+        os.replace(tmp, ruta)
+        for viejo in glob.glob(_ruta_cache(nombre, "*", dir_cache)):
+            if viejo != ruta:
+                os.remove(viejo)
+    except OSError:
+        # Un directorio de sólo lectura no debe impedir servir los datos.
+        pass
+
+
+def cargar_maestro(ruta=CSV_MAESTRO, pesos=None, usar_cache=True, dir_cache=DIR_CACHE):
+    """Maestro preprocesado con "Región Nacional", servido desde la caché en disco si es posible.
+
+    Por defecto la serie nacional pondera cada región por su importancia
+    relativa según ``ponderaciones_limpias.csv``.
+    """
+    pesos = pesos_regionales() if pesos is None else pesos
+    clave = huella([ruta], pesos) if usar_cache else None
+    if usar_cache:
+        df = leer_cache("maestro", clave, dir_cache)
+        if df is not None:
+            return df
+
+    df = aplicar_esquema(agregar_nacional(leer_maestro(ruta), pesos))
+    if usar_cache:
+        escribir_cache(df, "maestro", clave, dir_cache)
+    return df
+
+
+# --- Carga por origen ---
+# Cada origen tiene su propia entrada en la caché en disco, con sólo sus
+# filas y columnas: la vista por defecto no lee los precios promedio.
+
+def _nombre_cache_origen(origen):
+    return f"origen_{origen}"
+
+
+def _escribir_origenes(columna, clave, dir_cache):
+    origenes = sorted(columna.dropna().unique())
+    escribir_cache(pd.DataFrame({"origen": origenes}), "origenes", clave, dir_cache)
+    return origenes
+
+
+def escribir_caches_origen(df, clave, dir_cache=DIR_CACHE):
+    """Guarda en la caché una entrada por origen de ``df`` y la lista de orígenes."""
+    origenes = _escribir_origenes(df["origen"], clave, dir_cache)
+    for origen in origenes:
+        parte = df.loc[df["origen"] == origen, columnas_origen(origen)].reset_index(drop=True)
+        escribir_cache(aplicar_esquema(parte), _nombre_cache_origen(origen), clave, dir_cache)
+    return origenes
+
+
+def origenes_maestro(ruta=CSV_MAESTRO, pesos=None, dir_cache=DIR_CACHE):
+    """Orígenes presentes en el maestro, sin cargar sus datos."""
+    clave = huella([ruta], pesos_regionales() if pesos is None else pesos)
+    df = leer_cache("origenes", clave, dir_cache)
+    if df is None:
+        return _escribir_origenes(pd.read_csv(ruta, usecols=["origen"])["origen"], clave, dir_cache)
+    return df["origen"].tolist()
+
+
+def cargar_origen(origen, ruta=CSV_MAESTRO, pesos=None, usar_cache=True, dir_cache=DIR_CACHE):
+    """Como ``cargar_maestro`` pero sólo con las filas y las columnas de ``origen``."""
+    pesos = pesos_regionales() if pesos is None else pesos
+    clave = huella([ruta], pesos) if usar_cache else None
+    if usar_cache:
+        df = leer_cache(_nombre_cache_origen(origen), clave, dir_cache)
+        if df is not None:
+            return df
+
+    df = leer_maestro(ruta, columnas_origen(origen))
+    if usar_cache:
+        # Ya se leyó la columna completa: de paso queda la lista de orígenes.
+        _escribir_origenes(df["origen"], clave, dir_cache)
+    df = df[df["origen"] == origen].reset_index(drop=True)
+    if "indice" in df:
+        df = agregar_nacional(df, pesos)
+    df = aplicar_esquema(df)
+    if usar_cache:
+        escribir_cache(df, _nombre_cache_origen(origen), clave, dir_cache)
+    return df
+
+
+# --- Índice de series para los filtros ---
+CLAVES_SERIE = ["origen", "region", "categoria"]
+
+
+def indexar_series(df):
+    """Ordena ``df`` por serie y fecha y arma el índice de filtros.
+
+    Devuelve ``(df_ordenado, indice)``. Cada serie (origen, región,
+    categoría) ocupa un tramo contiguo de filas, así que filtrarla es un
+    ``iloc`` sobre un rango sin máscaras ni copias. ``indice`` contiene:
+
+    - ``"series"``: ``{(origen, region, categoria): (inicio, fin)}``
+    - ``"origenes"``: orígenes ordenados
+    - ``"regiones"``: ``{origen: [regiones ordenadas]}``
+    - ``"categorias"``: ``{(origen, region): [categorías ordenadas]}``
+    """
+    df = df.dropna(subset=CLAVES_SERIE).sort_values(CLAVES_SERIE + ["fecha"], kind="stable")
+    df = df.reset_index(drop=True)
+
+    claves = [df[c].to_numpy() for c in CLAVES_SERIE]
+    cambio = np.zeros(len(df), dtype=bool)
+    cambio[:1] = True
+    for col in claves:
+        cambio[1:] |= col[1:] != col[:-1]
+    inicios = np.flatnonzero(cambio)
+    fines = np.append(inicios[1:], len(df))
+
+    series = {}
+    regiones = {}
+    categorias = {}
+    for inicio, fin in zip(inicios.tolist(), fines.tolist()):
+        origen, region, categoria = (col[inicio] for col in claves)
+        series[(origen, region, categoria)] = (inicio, fin)
+        regiones.setdefault(origen, []).append(region)
+        categorias.setdefault((origen, region), []).append(categoria)
+
+    indice = {
+        "series": series,
+        "origenes": list(regiones),
+        "regiones": {o: list(dict.fromkeys(r)) for o, r in regiones.items()},
+        "categorias": categorias,
+    }
+    return df, indice
+
+
+def obtener_serie(df, indice, origen, region, categoria):
+    """Filas de una serie ordenadas por fecha (vista sobre ``df``, sin copiar)."""
+    inicio, fin = indice["series"].get((origen, region, categoria), (0, 0))
+    return df.iloc[inicio:fin]
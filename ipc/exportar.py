@@ -0,0 +1,213 @@
+"""Exportación del dataset calculado para análisis fuera de la app.
+
+    python -m ipc.exportar --salida exportacion
+
+Escribe el maestro con "Región Nacional", sus variaciones y las métricas
+derivadas (``metricas.METRICAS``) en dos formatos:
+
+- ``parquet/origen=<origen>/anio=<año>/parte.parquet``: particionado
+  estilo Hive (``pyarrow.dataset`` o pandas lo leen con las columnas de
+  partición), comprimido con zstd y escrito por lotes de filas;
+- ``series/<origen>/<region>/<categoria>.json.gz``: un JSON compacto por
+  serie (arreglos por columna, meses ``AAAA-MM``) para clientes web, más
+  ``series/indice.json`` con la lista de series y sus archivos.
+
+``manifiesto.json`` guarda la huella del contenido (CSV maestro,
+ponderaciones y versión de la exportación). Si la huella no cambió no se
+escribe nada, así que un job nocturno sin datos nuevos termina enseguida.
+La exportación se arma en un directorio temporal que reemplaza al
+anterior al final: nadie lee una exportación a medio escribir.
+"""
+import argparse
+import gzip
+import json
+import os
+import shutil
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .almacen import preparar_datos
+from .datos import CSV_MAESTRO, huella
+from .metricas import METRICAS
+from .ponderaciones import CSV_PONDERACIONES, pesos_regionales
+from .series import nombre_archivo
+
+# Subirla cuando cambia el cálculo o el formato de lo exportado.
+VERSION_EXPORTACION = 1
+MANIFIESTO = "manifiesto.json"
+TAMANO_LOTE = 50_000
+COMPRESION_PARQUET = "zstd"
+# Decimales de los valores en los JSON por serie (el Parquet guarda todos).
+DECIMALES_JSON = 4
+
+
+def huella_exportacion(ruta=CSV_MAESTRO, pesos=None):
+    """Huella de todo lo que determina el contenido exportado."""
+    pesos = pesos_regionales() if pesos is None else pesos
+    return f"{huella([ruta, CSV_PONDERACIONES], pesos)}v{VERSION_EXPORTACION}"
+
+
+def leer_manifiesto(salida):
+    """Manifiesto de la exportación en ``salida``, o ``None`` si no hay."""
+    try:
+        with open(os.path.join(salida, MANIFIESTO), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def dataset_exportable(df, indice, tablas):
+    """``df`` (ordenado por serie, de ``indexar_series``) con una columna por métrica derivada."""
+    claves = list(indice["series"])
+    tramos = np.array([indice["series"][k] for k in claves], dtype=np.int64).reshape(-1, 2)
+    filas = np.repeat(np.arange(len(claves)), tramos[:, 1] - tramos[:, 0])
+    meses = df["fecha"].to_numpy().astype("datetime64[M]").astype("int64")
+
+    columnas = {}
+    for nombre in (m for m in METRICAS if m in tablas):
+        tabla = tablas[nombre]
+        col = meses - tabla["mes0"]
+        dentro = (col >= 0) & (col < tabla["valores"].shape[1])
+        valores = np.full(len(df), np.nan)
+        valores[dentro] = tabla["valores"][filas[dentro], col[dentro]]
+        columnas[nombre] = valores
+    return df.assign(**columnas)
+
+
+def escribir_parquet(df, destino, tamano_lote=TAMANO_LOTE):
+    """Particiones ``origen``/``anio`` de ``df`` en ``destino``; devuelve ``{particion: filas}``."""
+    anios = df["fecha"].dt.year.to_numpy()
+    origenes = df["origen"].astype(str).to_numpy()
+    datos = df.drop(columns="origen")
+    esquema = pa.Schema.from_pandas(datos.iloc[:0], preserve_index=False)
+
+    particiones = {}
+    for (origen, anio), posiciones in datos.groupby([origenes, anios], sort=True).indices.items():
+        carpeta = os.path.join(destino, f"origen={origen}", f"anio={anio}")
+        os.makedirs(carpeta, exist_ok=True)
+        with pq.ParquetWriter(os.path.join(carpeta, "parte.parquet"), esquema,
+                              compression=COMPRESION_PARQUET) as escritor:
+            for i in range(0, len(posiciones), tamano_lote):
+                lote = datos.iloc[posiciones[i:i + tamano_lote]]
+                escritor.write_table(pa.Table.from_pandas(lote, schema=esquema, preserve_index=False))
+        particiones[f"origen={origen}/anio={anio}"] = len(posiciones)
+    return particiones
+
+
+def _valores_json(valores):
+    """Arreglo como lista JSON, con ``null`` en lugar de NaN."""
+    if valores.dtype.kind == "f":
+        return [None if v != v else v for v in np.round(valores, DECIMALES_JSON).tolist()]
+    return [None if v is None or v != v else v for v in valores.tolist()]
+
+
+def escribir_series_json(df, indice, destino):
+    """Un ``.json.gz`` por serie de ``df`` en ``destino``; devuelve el índice de series."""
+    columnas = [c for c in df.columns if c not in ("origen", "region", "categoria", "fecha")]
+    arreglos = {c: df[c].to_numpy() for c in columnas}
+    nulos = {c: df[c].isna().to_numpy() for c in columnas}
+    fechas = df["fecha"].to_numpy().astype("datetime64[M]").astype(str)
+
+    series = []
+    usados = set()
+    for (origen, region, categoria), (inicio, fin) in indice["series"].items():
+        serie = {"origen": origen, "region": region, "categoria": categoria, "fechas": fechas[inicio:fin].tolist()}
+        for c in columnas:
+            if not nulos[c][inicio:fin].all():
+                serie[c] = _valores_json(arreglos[c][inicio:fin])
+
+        base = os.path.join(nombre_archivo(origen), nombre_archivo(region), nombre_archivo(categoria))
+        # Categorías que sólo difieren en espacios o símbolos no se pisan.
+        relativo, n = f"{base}.json.gz", 1
+        while relativo in usados:
+            n += 1
+            relativo = f"{base}_{n}.json.gz"
+        usados.add(relativo)
+        os.makedirs(os.path.dirname(os.path.join(destino, relativo)), exist_ok=True)
+        cuerpo = json.dumps(serie, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        with open(os.path.join(destino, relativo), "wb") as f:
+            # ``mtime=0``: el mismo contenido produce siempre los mismos bytes.
+            f.write(gzip.compress(cuerpo, compresslevel=6, mtime=0))
+        series.append({
+            "origen": origen,
+            "region": region,
+            "categoria": categoria,
+            "archivo": relativo.replace(os.sep, "/"),
+            "desde": serie["fechas"][0] if serie["fechas"] else None,
+            "hasta": serie["fechas"][-1] if serie["fechas"] else None,
+        })
+
+    with open(os.path.join(destino, "indice.json"), "w", encoding="utf-8") as f:
+        json.dump(series, f, ensure_ascii=False, separators=(",", ":"))
+    return series
+
+
+def exportar(salida, ruta=CSV_MAESTRO, forzar=False, tamano_lote=TAMANO_LOTE):
+    """Exporta el dataset calculado a ``salida``; devuelve ``(manifiesto, escrita)``.
+
+    Si el manifiesto de ``salida`` ya tiene la huella actual (y no se pide
+    ``forzar``) no se escribe nada y ``escrita`` es ``False``. Sólo se
+    reemplaza una exportación anterior (con manifiesto) o un directorio
+    vacío; cualquier otra cosa en ``salida`` lanza ``ValueError``.
+    """
+    clave = huella_exportacion(ruta)
+    anterior = leer_manifiesto(salida)
+    if not forzar and anterior is not None and anterior.get("huella") == clave:
+        return anterior, False
+    if anterior is None and os.path.exists(salida) and not (os.path.isdir(salida) and not os.listdir(salida)):
+        raise ValueError(f"{salida} existe y no es una exportación anterior (no tiene {MANIFIESTO}): "
+                         "elegí otro directorio de salida.")
+
+    df, indice, tablas, _ = preparar_datos(ruta)
+    df = dataset_exportable(df, indice, tablas)
+
+    tmp = f"{os.path.abspath(salida)}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    try:
+        particiones = escribir_parquet(df, os.path.join(tmp, "parquet"), tamano_lote)
+        series = escribir_series_json(df, indice, os.path.join(tmp, "series"))
+        manifiesto = {
+            "huella": clave,
+            "filas": len(df),
+            "columnas": list(df.columns),
+            "particiones": particiones,
+            "series": len(series),
+        }
+        with open(os.path.join(tmp, MANIFIESTO), "w", encoding="utf-8") as f:
+            json.dump(manifiesto, f, ensure_ascii=False, indent=2)
+
+        # Se reemplaza la exportación anterior recién con la nueva completa.
+        viejo = f"{os.path.abspath(salida)}.{os.getpid()}.viejo"
+        if os.path.exists(salida):
+            os.rename(salida, viejo)
+        os.rename(tmp, salida)
+        shutil.rmtree(viejo, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return manifiesto, True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta el dataset del IPC a Parquet particionado y JSON por serie.")
+    parser.add_argument("--salida", default="exportacion", help="Directorio de la exportación.")
+    parser.add_argument("--maestro", default=CSV_MAESTRO)
+    parser.add_argument("--lote", type=int, default=TAMANO_LOTE, help="Filas por lote al escribir el Parquet.")
+    parser.add_argument("--forzar", action="store_true", help="Exportar aunque la huella no haya cambiado.")
+    args = parser.parse_args()
+
+    try:
+        manifiesto, escrita = exportar(args.salida, args.maestro, args.forzar, args.lote)
+    except ValueError as e:
+        parser.exit(1, f"{e}\n")
+    if not escrita:
+        print(f"Sin cambios (huella {manifiesto['huella']}): no se escribió nada.")
+        return
+    print(f"{manifiesto['filas']} filas en {len(manifiesto['particiones'])} particiones "
+          f"y {manifiesto['series']} series en {args.salida} (huella {manifiesto['huella']}).")
+
+
+if __name__ == "__main__":
+    main()
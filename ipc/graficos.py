@@ -0,0 +1,315 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# --- Caché LRU de figuras por selección ---
+# Las figuras cacheadas se comparten entre sesiones: no deben modificarse
+# después de construidas.
+MAX_FIGURAS = 256
+
+_figuras = OrderedDict()
+_lock = threading.Lock()
+_estadisticas = {"aciertos": 0, "fallos": 0}
+
+# --- Render liviano ---
+# Sólo para figuras de más de UMBRAL_WEBGL puntos en total: las líneas
+# pasan a WebGL, cada traza se reduce con LTTB a MAX_PUNTOS (o menos,
+# para que la figura no pase de MAX_PUNTOS_FIGURA) y los rótulos de
+# texto se ralean a MAX_ETIQUETAS por traza. Las más chicas quedan igual.
+MAX_PUNTOS = 400
+MAX_PUNTOS_FIGURA = 10000
+UMBRAL_WEBGL = 2000
+MAX_ETIQUETAS = 40
+
+
+def clave_figura(tipo, origen, region, categoria, columna, desde_str, hasta_str, version=None, liviano=False):
+    """Clave de caché de una selección; ``version`` identifica los datos cargados."""
+    return (version, tipo, origen, region, categoria, columna, desde_str, hasta_str, liviano)
+
+
+def obtener_figura(clave, construir):
+    """Devuelve la figura cacheada para ``clave`` o la arma con ``construir()``."""
+    with _lock:
+        if clave in _figuras:
+            _figuras.move_to_end(clave)
+            _estadisticas["aciertos"] += 1
+            return _figuras[clave]
+        _estadisticas["fallos"] += 1
+
+    fig = construir()
+    with _lock:
+        _figuras[clave] = fig
+        _figuras.move_to_end(clave)
+        while len(_figuras) > MAX_FIGURAS:
+            _figuras.popitem(last=False)
+    return fig
+
+
+def obtener_figura_json(clave, construir):
+    """Como ``obtener_figura`` pero devuelve (y cachea) el JSON de la figura."""
+    return obtener_figura(("json",) + tuple(clave), lambda: pio.to_json(construir(), validate=False))
+
+
+def info_cache_figuras():
+    """Entradas, aciertos y fallos de la caché de figuras."""
+    with _lock:
+        return {"entradas": len(_figuras), "max": MAX_FIGURAS, **_estadisticas}
+
+
+def limpiar_cache_figuras():
+    with _lock:
+        _figuras.clear()
+        _estadisticas.update(aciertos=0, fallos=0)
+
+
+def lttb(y, n):
+    """Posiciones de los ``n`` puntos que conserva Largest-Triangle-Three-Buckets.
+
+    Se usa la posición como eje x: las series son mensuales y
+    equiespaciadas. Los nulos no compiten por quedar en la muestra.
+    """
+    y = np.asarray(y, dtype="float64")
+    validos = np.flatnonzero(~np.isnan(y))
+    largo = len(validos)
+    if n >= largo or n < 3:
+        return validos
+    y = y[validos]
+
+    bordes = np.linspace(1, largo - 1, n - 1).astype(np.int64)
+    # Promedio de cada balde, que hace de tercer vértice para el anterior.
+    promedios_x = np.append((bordes[:-1] + bordes[1:] - 1) / 2, largo - 1)
+    promedios_y = np.append(np.add.reduceat(y[:largo - 1], bordes[:-1]) / np.diff(bordes), y[-1])
+
+    elegidos = np.empty(n, dtype=np.int64)
+    elegidos[0], elegidos[-1] = 0, largo - 1
+    previo = 0
+    for i in range(n - 2):
+        ini, fin = bordes[i], bordes[i + 1]
+        x_prom, y_prom = promedios_x[i + 1], promedios_y[i + 1]
+        xs = np.arange(ini, fin)
+        areas = np.abs((previo - x_prom) * (y[ini:fin] - y[previo]) - (previo - xs) * (y_prom - y[previo]))
+        previo = ini + int(areas.argmax())
+        elegidos[i + 1] = previo
+    return validos[elegidos]
+
+
+def aligerar_figura(fig, max_puntos=MAX_PUNTOS, max_puntos_figura=MAX_PUNTOS_FIGURA,
+                    umbral_webgl=UMBRAL_WEBGL, max_etiquetas=MAX_ETIQUETAS):
+    """Copia de ``fig`` con menos puntos, rótulos raleados y WebGL si es grande.
+
+    Con hasta ``umbral_webgl`` puntos de línea en total devuelve ``fig``
+    tal cual. Sólo toca trazas ``scatter`` (plotly express ya arma
+    ``scattergl`` con más de 1000 puntos); las barras quedan igual. Las
+    fechas del eje x viajan como texto ``%Y-%m-%d`` en vez de timestamps
+    con nanosegundos. ``fig`` no se modifica (puede venir de la caché).
+    """
+    trazas = [t.to_plotly_json() for t in fig.data]
+    lineas = [t for t in trazas if t["type"] in ("scatter", "scattergl") and t.get("y") is not None]
+    if sum(len(t["y"]) for t in lineas) <= umbral_webgl:
+        return fig
+    max_puntos = max(min(max_puntos, max_puntos_figura // len(lineas)), 3)
+    for traza in lineas:
+        x = traza.get("x")
+        if isinstance(x, np.ndarray) and np.issubdtype(x.dtype, np.datetime64):
+            traza["x"] = np.datetime_as_string(x, unit="D")
+        largo = len(traza["y"])
+        if largo > max_puntos:
+            pos = lttb(traza["y"], max_puntos)
+            for campo in ("x", "y", "text", "customdata", "hovertext"):
+                valores = traza.get(campo)
+                if valores is not None and not isinstance(valores, str) and len(valores) == largo:
+                    traza[campo] = np.asarray(valores)[pos]
+        texto = traza.get("text")
+        if texto is not None and not isinstance(texto, str) and len(texto) > max_etiquetas:
+            paso = -(-len(texto) // max_etiquetas)
+            ralo = np.full(len(texto), "", dtype=object)
+            ralo[::paso] = np.asarray(texto, dtype=object)[::paso]
+            ralo[-1] = texto[-1]
+            traza["text"] = ralo
+        traza["type"] = "scattergl"
+
+    nueva = go.Figure(layout=fig.layout)
+    with nueva.batch_update():
+        nueva.add_traces(trazas)
+    return nueva
+
+
+def figura_serie_temporal(datos, columna, categoria, region, origen):
+    """Figura de la serie temporal de ``columna`` para el tramo ``datos``."""
+    # --- Mostrar variación interanual SIEMPRE como barras ---
+    if columna == "variacion_interanual":
+        fig = px.bar(
+            datos,
+            x="fecha",
+            y=columna,
+            text=datos[columna].apply(lambda v: f"{v:.2f}%"),
+            title=f"Variación interanual – {categoria} en {region} ({origen})"
+        )
+        fig.update_traces(
+            textposition="outside",
+            textfont=dict(size=13, color="black")
+        )
+        return fig
+
+    fig = px.line(
+        datos,
+        x="fecha",
+        y=columna,
+        markers=True,
+        title=f"Evolución {columna} – {categoria} en {region} ({origen})"
+    )
+    if columna in ["variacion_mensual"]:
+        fig.update_traces(
+            text=[f"{v:.2f}%" for v in datos[columna]],
+            textposition="top center",
+            textfont=dict(size=13, color="black"),
+            mode="lines+markers+text"
+        )
+    else:
+        valor_inicio = datos[columna].iloc[0]
+        valor_final = datos[columna].iloc[-1]
+        variacion_pct = (valor_final / valor_inicio - 1) * 100
+        fig.add_annotation(
+            text=f"Variación total: {variacion_pct:.2f}%",
+            xref="paper", yref="paper", x=0.5, y=1.1, showarrow=False,
+            font=dict(size=14, color="black", family="Arial")
+        )
+    return fig
+
+
+def figura_acumulado(datos, categoria, region, origen):
+    """Figura del índice con la variación acumulada rotulada en cada punto."""
+    fig = px.line(
+        datos,
+        x="fecha",
+        y="indice",
+        markers=True,
+        title=f"Evolución del índice – {categoria} en {region} ({origen})"
+    )
+    fig.update_traces(
+        text=[f"{v:.1f}%" for v in datos["variacion_acum"]],
+        textposition="top center",
+        textfont=dict(size=12, color="black"),
+        mode="lines+markers+text"
+    )
+    return fig
+
+
+def figura_compuestos(datos, columna, referencia=None):
+    """Figura de los índices compuestos por región.
+
+    ``referencia`` (opcional) trae el "Nivel general" oficial de las mismas
+    regiones y se dibuja punteado para comparar.
+    """
+    fig = px.line(
+        datos.dropna(subset=[columna]),
+        x="fecha",
+        y=columna,
+        color="region",
+        title=f"Índice compuesto – {columna}"
+    )
+    if referencia is not None:
+        for region, datos_region in referencia.dropna(subset=[columna]).groupby("region", observed=True):
+            fig.add_scatter(
+                x=datos_region["fecha"],
+                y=datos_region[columna],
+                mode="lines",
+                name=f"{region} (Nivel general oficial)",
+                line=dict(dash="dot")
+            )
+    return fig
+
+
+def figura_precios(datos):
+    """Precio promedio de cada producto por región."""
+    return px.line(
+        datos,
+        x="fecha",
+        y="precio_promedio",
+        color="producto",
+        line_dash="region",
+        title="Precios promedio"
+    )
+
+
+def figura_ranking_precios(ranking, region, desde_str, hasta_str):
+    """Barras horizontales con los productos que más aumentaron."""
+    fig = px.bar(
+        ranking.iloc[::-1],
+        x="variacion_pct",
+        y="producto",
+        orientation="h",
+        text=ranking["variacion_pct"].iloc[::-1].apply(lambda v: f"{v:.1f}%"),
+        title=f"Mayores aumentos – {region} ({desde_str} → {hasta_str})"
+    )
+    fig.update_traces(textposition="outside")
+    return fig
+
+
+def figura_ranking_metrica(ranking, columna, titulo):
+    """Barras horizontales con las categorías ordenadas por ``columna``."""
+    fig = px.bar(
+        ranking.iloc[::-1],
+        x=columna,
+        y="categoria",
+        orientation="h",
+        text=ranking[columna].iloc[::-1].apply(lambda v: f"{v:.2f}"),
+        title=titulo
+    )
+    fig.update_traces(textposition="outside")
+    fig.update_layout(height=max(400, 24 * len(ranking)), yaxis_title=None)
+    return fig
+
+
+def figura_mapa_calor(pivote, columna, titulo):
+    """Mapa de calor serie × mes de ``columna`` (una sola traza), centrado en 0."""
+    fig = go.Figure(go.Heatmap(
+        z=pivote.to_numpy(),
+        x=list(pivote.columns),
+        y=list(pivote.index),
+        colorscale="RdBu_r",
+        zmid=0,
+        colorbar_title="%",
+        hovertemplate="%{y}<br>%{x}: %{z:.1f}%<extra></extra>",
+    ))
+    fig.update_layout(
+        title=titulo,
+        height=max(400, 22 * len(pivote) + 150),
+        xaxis_title="fecha",
+        yaxis=dict(autorange="reversed", title=None),
+    )
+    return fig
+
+
+def figura_comparacion(datos, columna, base_100=False):
+    """Varias series superpuestas, una línea por región y categoría.
+
+    ``datos`` viene de ``consultas.series_alineadas`` (contiguo por serie).
+    Las trazas se arman directo sobre los tramos de cada serie en vez de
+    agrupar con plotly express, que con cientos de series domina el tiempo
+    de render.
+    """
+    etiquetas = (datos["region"].astype(str) + " – " + datos["categoria"].astype(str)).to_numpy()
+    cortes = np.flatnonzero(etiquetas[1:] != etiquetas[:-1]) + 1
+    x = datos["fecha"].to_numpy()
+    y = datos[columna].to_numpy()
+
+    fig = go.Figure()
+    with fig.batch_update():
+        fig.add_traces([
+            dict(type="scatter", x=x[a:b], y=y[a:b], mode="lines", name=etiquetas[a])
+            for a, b in zip(np.r_[0, cortes], np.r_[cortes, len(datos)])
+        ])
+        fig.update_layout(
+            title=f"Comparación de series – {columna}" + (" (base 100 en Desde)" if base_100 else ""),
+            xaxis_title="fecha",
+            yaxis_title=columna,
+            legend_title_text="serie"
+        )
+    if base_100:
+        fig.add_hline(y=100, line_dash="dot", line_color="gray")
+    return fig
@@ -0,0 +1,173 @@
+"""Ingesta incremental de meses nuevos al maestro del IPC.
+
+    python -m ipc.ingesta delta.csv
+
+El delta tiene el mismo formato que ``ipc_maestro_sin_ponderaciones.csv``
+y sólo trae los meses nuevos. Se valida contra el maestro, se anexa al
+CSV y la caché en disco se reescribe con la serie "Región Nacional"
+extendida sin recalcular la historia completa.
+"""
+import argparse
+import os
+
+import pandas as pd
+
+from .agregacion import CLAVES_NACIONAL, REGION_NACIONAL, calcular_nacional, calcular_variaciones
+from .calidad import resumen, validar
+from .datos import (
+    CLAVES_SERIE,
+    CSV_MAESTRO,
+    DIR_CACHE,
+    aplicar_esquema,
+    cargar_maestro,
+    escribir_cache,
+    escribir_caches_origen,
+    huella,
+    leer_maestro,
+)
+from .ponderaciones import pesos_regionales
+
+# Filas previas por serie necesarias para la variación interanual.
+MESES_COLA = 12
+
+
+def validar_delta(maestro, delta):
+    """Verifica que ``delta`` sólo agregue meses nuevos y contiguos a ``maestro``.
+
+    Lanza ``ValueError`` con la lista de problemas encontrados.
+    """
+    problemas = []
+
+    faltantes = set(maestro.columns) - set(delta.columns)
+    if faltantes:
+        problemas.append(f"faltan columnas: {sorted(faltantes)}")
+        raise ValueError("Delta inválido:\n- " + "\n- ".join(problemas))
+
+    nulos = delta[CLAVES_SERIE + ["fecha"]].isna().any(axis=1)
+    if nulos.any():
+        problemas.append(f"{int(nulos.sum())} filas con claves o fecha nulas")
+    if (delta["region"] == REGION_NACIONAL).any():
+        problemas.append(f'"{REGION_NACIONAL}" se calcula, no se ingiere')
+    duplicadas = delta.duplicated(CLAVES_SERIE + ["fecha", "unidad_medida"])
+    if duplicadas.any():
+        problemas.append(f"{int(duplicadas.sum())} filas duplicadas por (origen, region, categoria, fecha, unidad_medida)")
+
+    # --- Continuidad contra el último mes de cada serie ---
+    ultimo = (
+        maestro[maestro["region"] != REGION_NACIONAL]
+        .groupby(CLAVES_SERIE, observed=True)["fecha"].max()
+        .rename("ultimo")
+    )
+    primero = delta.dropna(subset=CLAVES_SERIE).groupby(CLAVES_SERIE)["fecha"].min().rename("primero")
+    cruce = pd.concat([primero, ultimo], axis=1, join="inner")
+    solapadas = cruce[cruce["primero"] <= cruce["ultimo"]]
+    if len(solapadas):
+        problemas.append(f"{len(solapadas)} series con meses ya cargados, p. ej. {solapadas.index[0]}")
+    huecos = cruce[cruce["primero"] > cruce["ultimo"] + pd.DateOffset(months=1)]
+    if len(huecos):
+        problemas.append(f"{len(huecos)} series con meses salteados, p. ej. {huecos.index[0]}")
+
+    if problemas:
+        raise ValueError("Delta inválido:\n- " + "\n- ".join(problemas))
+
+
+def calidad_delta(maestro, delta, pesos=None):
+    """Reporte de ``calidad`` de los meses de ``delta``.
+
+    Se valida junto con el último mes ya cargado de cada serie, para que
+    la variación del primer mes nuevo se compare contra el maestro. Lanza
+    ``ValueError`` si hay errores y devuelve los avisos.
+    """
+    previo = maestro[maestro["region"] != REGION_NACIONAL]
+    previo = previo[previo["fecha"] == previo.groupby(CLAVES_SERIE, observed=True)["fecha"].transform("max")]
+    reporte = validar(pd.concat([previo, delta], ignore_index=True), pesos)
+    reporte = reporte[reporte["fecha"].isna() | reporte["fecha"].isin(delta["fecha"].unique())]
+
+    errores = reporte[reporte["severidad"] == "error"]
+    if len(errores):
+        ejemplos = [f"{f.chequeo}: {f.origen}, {f.region}, {f.categoria}, {f.fecha}" for f in errores.head(5).itertuples()]
+        raise ValueError(f"Delta con {len(errores)} errores de calidad:\n- " + "\n- ".join(ejemplos))
+    return reporte.reset_index(drop=True)
+
+
+def anexar_delta(maestro, delta, pesos=None):
+    """Devuelve ``maestro`` extendido con ``delta`` y su "Región Nacional".
+
+    Sólo se recalcula la cola de cada serie nacional: las últimas
+    ``MESES_COLA`` filas ya cargadas más los meses nuevos.
+    """
+    nuevos = calcular_nacional(delta, pesos)[CLAVES_NACIONAL + ["indice"]]
+
+    claves = ["categoria", "origen"]
+    nacional = maestro[maestro["region"] == REGION_NACIONAL]
+    cola = nacional.sort_values("fecha").groupby(claves, observed=True).tail(MESES_COLA)
+    cola = cola[CLAVES_NACIONAL + ["indice"]]
+
+    tramo = pd.concat([cola.assign(_nuevo=False), nuevos.assign(_nuevo=True)], ignore_index=True)
+    tramo = calcular_variaciones(tramo)
+    tramo = tramo[tramo["_nuevo"]].drop(columns="_nuevo")
+    tramo["region"] = REGION_NACIONAL
+
+    anexo = pd.concat([delta, tramo], ignore_index=True)[list(maestro.columns)]
+    return aplicar_esquema(pd.concat([maestro, anexo], ignore_index=True))
+
+
+def _anexar_csv(delta, ruta):
+    """Agrega las filas de ``delta`` al final del CSV maestro."""
+    with open(ruta, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(f.tell() - 2, 0))
+        final = f.read()
+    # Se respeta el fin de línea del archivo existente.
+    fin_linea = "\r\n" if final.endswith(b"\r\n") else "\n"
+    columnas = list(pd.read_csv(ruta, nrows=0).columns)
+    filas = delta.assign(fecha=delta["fecha"].dt.strftime("%Y-%m"))[columnas]
+    with open(ruta, "a", encoding="utf-8", newline="") as f:
+        if final and not final.endswith(b"\n"):
+            f.write(fin_linea)
+        filas.to_csv(f, header=False, index=False, lineterminator=fin_linea)
+
+
+def ingerir(ruta_delta, ruta_maestro=CSV_MAESTRO, pesos=None, dir_cache=DIR_CACHE, escribir=True):
+    """Valida ``ruta_delta``, lo anexa al maestro y actualiza la caché en disco.
+
+    Devuelve el maestro actualizado, el delta y los avisos de calidad del delta.
+    """
+    pesos = pesos_regionales() if pesos is None else pesos
+    maestro = cargar_maestro(ruta_maestro, pesos, dir_cache=dir_cache)
+    delta = leer_maestro(ruta_delta)
+    validar_delta(maestro, delta)
+    avisos = calidad_delta(maestro, delta, pesos)
+    actualizado = anexar_delta(maestro, delta, pesos)
+
+    if escribir:
+        _anexar_csv(delta, ruta_maestro)
+        # La huella nueva deja obsoletas sólo las entradas del maestro anterior.
+        clave = huella([ruta_maestro], pesos)
+        escribir_cache(actualizado, "maestro", clave, dir_cache)
+        escribir_caches_origen(actualizado, clave, dir_cache)
+    return actualizado, delta, avisos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Anexa meses nuevos al maestro del IPC.")
+    parser.add_argument("delta", help="CSV con los meses nuevos, mismo formato que el maestro")
+    parser.add_argument("--maestro", default=CSV_MAESTRO)
+    parser.add_argument("--dir-cache", default=DIR_CACHE)
+    parser.add_argument("--validar", action="store_true", help="Sólo validar, sin escribir nada.")
+    args = parser.parse_args()
+
+    try:
+        actualizado, delta, avisos = ingerir(args.delta, args.maestro, dir_cache=args.dir_cache, escribir=not args.validar)
+    except ValueError as e:
+        parser.exit(1, f"{e}\n")
+
+    meses = ", ".join(sorted(delta["fecha"].dt.strftime("%Y-%m").unique()))
+    accion = "validadas" if args.validar else "anexadas"
+    print(f"{len(delta)} filas {accion} ({meses}); maestro con {len(actualizado)} filas.")
+    if len(avisos):
+        print(f"Avisos de calidad:\n{resumen(avisos).to_string(index=False)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Métricas derivadas del índice para todas las series a la vez.
+
+Cada métrica es una tabla serie × mes con el mismo formato (y las mismas
+filas) que las de ``consultas.construir_tabla``, así que se guarda junto
+a ``variacion_mensual`` y ``variacion_interanual`` y sirve para las
+mismas consultas. Se calculan con desplazamientos y sumas acumuladas
+sobre la matriz completa, sin recorrer series:
+
+- ``anualizada_3m`` / ``anualizada_6m``: variación de 3 o 6 meses llevada
+  a un año;
+- ``acumulada_anio``: variación respecto de diciembre del año anterior;
+- ``acumulada_12m``: las variaciones mensuales publicadas encadenadas en
+  una ventana móvil de 12 meses (nula si falta alguna);
+- ``incidencia_mensual``: aporte de la categoría, en puntos porcentuales,
+  a la variación mensual del "Nivel general" de su región, según las
+  ponderaciones del IPC.
+"""
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from .consultas import mes_absoluto, meses_con_datos
+from .ponderaciones import VARIANTES_CATEGORIA, cargar_ponderaciones, filas_tabla, pesos_cuadro
+
+METRICAS = {
+    "anualizada_3m": "Variación de 3 meses anualizada (%)",
+    "anualizada_6m": "Variación de 6 meses anualizada (%)",
+    "acumulada_anio": "Variación acumulada en el año (%)",
+    "acumulada_12m": "Variaciones mensuales encadenadas, 12 meses (%)",
+    "incidencia_mensual": "Incidencia en la variación mensual del Nivel general (p.p.)",
+}
+# Métricas que ya vienen en el maestro y también se pueden rankear.
+METRICAS_MAESTRO = {
+    "variacion_mensual": "Variación mensual (%)",
+    "variacion_interanual": "Variación interanual (%)",
+}
+
+ORIGEN_METRICAS = "variaciones"
+CATEGORIA_TOTAL = "Nivel general"
+
+
+def _tabla_derivada(base, nombre, matriz):
+    """Tabla ``nombre`` con las filas y el eje de meses de ``base``."""
+    huella = hashlib.sha1(matriz.tobytes())
+    huella.update(repr((nombre, base["huella"])).encode())
+    return {**base, "columna": nombre, "huella": huella.hexdigest()[:16], "valores": matriz}
+
+
+def _desfasar(matriz, meses):
+    """``matriz`` corrida ``meses`` columnas hacia adelante (NaN al principio)."""
+    salida = np.full_like(matriz, np.nan)
+    if meses < matriz.shape[1]:
+        salida[:, meses:] = matriz[:, :matriz.shape[1] - meses]
+    return salida
+
+
+def _alinear(tabla, base):
+    """Valores de ``tabla`` sobre el eje de meses de ``base`` (mismas filas)."""
+    salida = np.full_like(base["valores"], np.nan)
+    n_meses = base["valores"].shape[1]
+    ini = tabla["mes0"] - base["mes0"]
+    origen = slice(max(-ini, 0), min(tabla["valores"].shape[1], n_meses - ini))
+    destino = slice(origen.start + ini, origen.stop + ini)
+    if origen.stop > origen.start:
+        salida[:, destino] = tabla["valores"][:, origen]
+    return salida
+
+
+def anualizada(indice, meses):
+    """Variación de ``meses`` meses del índice llevada a 12 meses, en %."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return ((indice / _desfasar(indice, meses)) ** (12 / meses) - 1) * 100
+
+
+def acumulada_anio(indice, mes0):
+    """Variación del índice respecto de diciembre del año anterior, en %."""
+    meses = np.arange(indice.shape[1]) + mes0
+    diciembre = meses - meses % 12 - 1 - mes0
+    base = np.full_like(indice, np.nan)
+    con_base = diciembre >= 0
+    base[:, con_base] = indice[:, diciembre[con_base]]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (indice / base - 1) * 100
+
+
+def encadenada(mensual, meses=12):
+    """Variaciones mensuales (%) encadenadas en una ventana móvil de ``meses``."""
+    logs = np.log1p(mensual / 100)
+    nulos = np.isnan(logs)
+    suma = np.cumsum(np.where(nulos, 0.0, logs), axis=1)
+    faltan = np.cumsum(nulos, axis=1, dtype="float64")
+    # Las primeras ``meses`` columnas quedan nulas: su ventana está incompleta.
+    ventana = suma - _desfasar(suma, meses)
+    huecos = faltan - _desfasar(faltan, meses)
+    return np.where(huecos == 0, np.expm1(ventana) * 100, np.nan)
+
+
+def pesos_series(tabla, origen=ORIGEN_METRICAS, pond=None):
+    """Peso (fracción del total de la canasta) de cada serie de ``tabla``; NaN si no tiene.
+
+    Las categorías de todos los cuadros son partes del mismo total, así
+    que se toma el peso del primer cuadro que trae cada una.
+    """
+    pond = cargar_ponderaciones() if pond is None else pond
+    pesos = pd.concat([pesos_cuadro(c, pond=pond) for c in pond["cuadro"].unique()])
+    pesos = pesos[~pesos.index.duplicated()]
+
+    filas = filas_tabla(tabla, origen, list(pesos.columns), list(pesos.index))
+    valores = pesos.to_numpy(dtype="float64").T / 100
+    por_serie = np.full(len(tabla["filas"]), np.nan)
+    presentes = filas >= 0
+    por_serie[filas[presentes]] = valores[presentes]
+    return por_serie
+
+
+def incidencia(tabla, pesos, origen=ORIGEN_METRICAS):
+    """Incidencia de cada serie en la variación mensual del "Nivel general" de su región, en p.p."""
+    indice = tabla["valores"]
+    series = tabla["series"]
+    # Fila del "Nivel general" de la región de cada serie.
+    total = series.get_indexer(pd.MultiIndex.from_arrays(
+        [series.get_level_values("origen"), series.get_level_values("region"), [CATEGORIA_TOTAL] * len(series)]
+    ))
+    total[series.get_level_values("origen") != origen] = -1
+
+    salida = np.full_like(indice, np.nan)
+    con_total = total >= 0
+    previo_total = _desfasar(indice[total[con_total]], 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        salida[con_total] = (
+            pesos[con_total, None] * (indice[con_total] - _desfasar(indice[con_total], 1)) / previo_total * 100
+        )
+    return salida
+
+
+def metricas_derivadas(tablas, origen=ORIGEN_METRICAS, pond=None):
+    """Tablas de ``METRICAS`` a partir de las tablas de ``consultas`` (hace falta la de ``indice``)."""
+    base = tablas["indice"]
+    indice = base["valores"]
+    derivadas = {
+        "anualizada_3m": anualizada(indice, 3),
+        "anualizada_6m": anualizada(indice, 6),
+        "acumulada_anio": acumulada_anio(indice, base["mes0"]),
+    }
+    if "variacion_mensual" in tablas:
+        derivadas["acumulada_12m"] = encadenada(_alinear(tablas["variacion_mensual"], base))
+    derivadas["incidencia_mensual"] = incidencia(base, pesos_series(base, origen, pond), origen)
+    return {nombre: _tabla_derivada(base, nombre, matriz) for nombre, matriz in derivadas.items()}
+
+
+def ranking_metrica(tabla, mes, region, categorias=None, origen=ORIGEN_METRICAS):
+    """Categorías de ``region`` ordenadas de mayor a menor por el valor de ``tabla`` en ``mes``.
+
+    Con ``categorias`` se rankean sólo esas (p. ej. las de un cuadro de
+    ponderaciones); si no, todas las de la región.
+    """
+    series = tabla["series"]
+    col = mes_absoluto(mes) - tabla["mes0"]
+    if not 0 <= col < tabla["valores"].shape[1]:
+        return pd.DataFrame({"categoria": [], tabla["columna"]: []})
+
+    elegidas = (series.get_level_values("origen") == origen) & (series.get_level_values("region") == region)
+    if categorias is not None:
+        nombres = list(categorias) + [v for c in categorias for v in VARIANTES_CATEGORIA.get(c, [])]
+        elegidas &= series.get_level_values("categoria").isin(nombres)
+    filas = np.flatnonzero(elegidas)
+    ranking = pd.DataFrame({
+        "categoria": series.get_level_values("categoria")[filas],
+        tabla["columna"]: tabla["valores"][filas, col],
+    })
+    ranking = ranking.dropna(subset=[tabla["columna"]])
+    return ranking.sort_values(tabla["columna"], ascending=False, kind="stable").reset_index(drop=True)
+
+
+def meses_ranking(tabla, region, origen=ORIGEN_METRICAS):
+    """Meses (``%Y-%m``) con algún valor de ``tabla`` en ``region``."""
+    claves = [k for k in tabla["filas"] if k[0] == origen and k[1] == region]
+    return meses_con_datos(tabla, claves)
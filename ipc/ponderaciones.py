@@ -0,0 +1,167 @@
+"""Índices compuestos a partir de las ponderaciones del IPC.
+
+``ponderaciones_limpias.csv`` trae, por región, los pesos de cada cuadro
+(Divisiones, Categorias, Bienes y servicios, Principales aperturas) y la
+importancia relativa de cada región en el total nacional. Con esos pesos
+(o con una canasta propia) se arma un índice compuesto para cada región
+como suma ponderada de los índices de sus categorías, en una sola
+operación matricial sobre todo el eje temporal de la tabla de
+``consultas``.
+"""
+import functools
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .agregacion import REGION_NACIONAL
+
+CSV_PONDERACIONES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ponderaciones_limpias.csv")
+
+# --- Normalización de nombres contra el maestro ---
+ALIAS_REGIONES = {
+    "GBA": "Región GBA",
+    "Pampeana": "Región Pampeana",
+    "NEA": "Región Noreste",
+    "Noreste": "Región Noreste",
+    "NOA": "Región Noroeste",
+    "Noroeste": "Región Noroeste",
+    "Cuyo": "Región Cuyo",
+    "Patagonia": "Región Patagonia",
+}
+ALIAS_CATEGORIAS = {
+    "Comunicaciones": "Comunicación",
+}
+# Nombres con los que la misma categoría aparece en algunas regiones del maestro.
+VARIANTES_CATEGORIA = {
+    "Azúcar, dulces, chocolate, golosinas, etc.": ["Azúcar, dulces, chocolate, golosinas, etc,"],
+}
+
+FILA_IMPORTANCIA_REGIONAL = "Importancia relativa de la región en el total nacional"
+CUADRO_DIVISIONES = "Divisiones"
+
+MAX_COMPUESTOS = 64
+
+_compuestos = OrderedDict()
+_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=4)
+def cargar_ponderaciones(ruta=CSV_PONDERACIONES):
+    """Ponderaciones en formato largo con regiones y categorías con los nombres del maestro."""
+    pond = pd.read_csv(ruta)
+    pond["region"] = pond["region"].map(ALIAS_REGIONES).fillna(pond["region"])
+    pond["categoria"] = pond["categoria"].replace(ALIAS_CATEGORIAS)
+    return pond
+
+
+def pesos_regionales(pond=None):
+    """Importancia relativa de cada región en el total nacional, normalizada a 1."""
+    pond = cargar_ponderaciones() if pond is None else pond
+    filas = pond[(pond["cuadro"] == CUADRO_DIVISIONES) & (pond["categoria"] == FILA_IMPORTANCIA_REGIONAL)]
+    total = filas["valor"].sum()
+    return {r: float(v / total) for r, v in zip(filas["region"], filas["valor"])}
+
+
+def pesos_cuadro(cuadro, categorias=None, pond=None):
+    """Pesos de ``cuadro`` como DataFrame categoría × región.
+
+    Incluye una columna "Región Nacional" con el promedio de los pesos
+    regionales ponderado por la importancia de cada región.
+    """
+    pond = cargar_ponderaciones() if pond is None else pond
+    filas = pond[(pond["cuadro"] == cuadro) & (pond["categoria"] != FILA_IMPORTANCIA_REGIONAL)]
+    if categorias is not None:
+        filas = filas[filas["categoria"].isin(categorias)]
+    pesos = filas.pivot_table(index="categoria", columns="region", values="valor", aggfunc="sum")
+
+    importancia = pd.Series(pesos_regionales(pond)).reindex(pesos.columns).fillna(0)
+    pesos[REGION_NACIONAL] = pesos.fillna(0).to_numpy() @ importancia.to_numpy() / importancia.sum()
+    return pesos
+
+
+def canasta(pesos, regiones):
+    """Convierte ``{categoria: peso}`` en el DataFrame categoría × región que usa el motor."""
+    serie = pd.Series(pesos, dtype="float64")
+    return pd.DataFrame({r: serie for r in regiones})
+
+
+def filas_tabla(tabla, origen, regiones, categorias):
+    """Matriz región × categoría con la fila de cada serie en ``tabla`` (-1 si falta)."""
+    filas = np.full((len(regiones), len(categorias)), -1, dtype=np.int64)
+    for i, region in enumerate(regiones):
+        for j, categoria in enumerate(categorias):
+            for nombre in [categoria] + VARIANTES_CATEGORIA.get(categoria, []):
+                fila = tabla["filas"].get((origen, region, nombre))
+                if fila is not None:
+                    filas[i, j] = fila
+                    break
+    return filas
+
+
+def indices_compuestos(tabla, pesos, origen="variaciones"):
+    """Índice compuesto por región como suma ponderada de los índices de sus categorías.
+
+    ``pesos`` es un DataFrame categoría × región (``pesos_cuadro`` o
+    ``canasta``); una celda nula o cero deja afuera esa categoría en esa
+    región. Los pesos de cada región se renormalizan sobre las categorías
+    que existen en ``tabla``, y en cada mes el índice es nulo si falta
+    alguno de sus componentes. Devuelve un frame largo con ``region``,
+    ``fecha``, ``indice``, ``variacion_mensual`` y ``variacion_interanual``.
+    """
+    regiones = list(pesos.columns)
+    categorias = list(pesos.index)
+    filas = filas_tabla(tabla, origen, regiones, categorias)
+
+    w = np.nan_to_num(pesos.to_numpy(dtype="float64").T)
+    w[filas < 0] = 0
+    suma = w.sum(axis=1, keepdims=True)
+    w = np.divide(w, suma, out=np.zeros_like(w), where=suma > 0)
+
+    # (región, categoría, mes): ceros donde la categoría no participa, para
+    # que no propague nulos.
+    valores = tabla["valores"][np.maximum(filas, 0)]
+    valores = np.where((w > 0)[:, :, None], valores, 0.0)
+    compuesto = np.einsum("rc,rct->rt", w, valores)
+    compuesto[suma[:, 0] == 0] = np.nan
+
+    n_meses = compuesto.shape[1]
+    mensual = np.full_like(compuesto, np.nan)
+    interanual = np.full_like(compuesto, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mensual[:, 1:] = (compuesto[:, 1:] / compuesto[:, :-1] - 1) * 100
+        interanual[:, 12:] = (compuesto[:, 12:] / compuesto[:, :-12] - 1) * 100
+
+    fechas = (np.arange(n_meses) + tabla["mes0"]).astype("datetime64[M]").astype("datetime64[ns]")
+    return pd.DataFrame({
+        "region": np.repeat(regiones, n_meses),
+        "fecha": np.tile(fechas, len(regiones)),
+        "indice": compuesto.ravel(),
+        "variacion_mensual": mensual.ravel(),
+        "variacion_interanual": interanual.ravel(),
+    })
+
+
+def _clave_pesos(pesos):
+    h = hashlib.sha1(pd.util.hash_pandas_object(pesos, index=True).to_numpy().tobytes())
+    h.update(repr(list(pesos.columns)).encode())
+    return h.hexdigest()
+
+
+def indices_compuestos_cacheados(tabla, pesos, origen="variaciones"):
+    """``indices_compuestos`` memoizado por datos (huella de la tabla) y conjunto de pesos."""
+    clave = (tabla["huella"], origen, _clave_pesos(pesos))
+    with _lock:
+        if clave in _compuestos:
+            _compuestos.move_to_end(clave)
+            return _compuestos[clave]
+
+    resultado = indices_compuestos(tabla, pesos, origen)
+    with _lock:
+        _compuestos[clave] = resultado
+        while len(_compuestos) > MAX_COMPUESTOS:
+            _compuestos.popitem(last=False)
+    return resultado
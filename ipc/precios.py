@@ -0,0 +1,103 @@
+"""Explorador de precios promedio sobre un arreglo producto × región × mes.
+
+El origen ``precios_promedio`` se vuelca una vez en un arreglo denso; las
+comparaciones entre productos, la variación entre dos meses y el ranking
+de aumentos son cortes y operaciones vectorizadas sobre ese arreglo, sin
+filtrar el frame en cada rerun. Un producto es el par (categoría, unidad
+de medida): el mismo nombre puede relevarse en presentaciones distintas.
+"""
+import numpy as np
+import pandas as pd
+
+from .consultas import mes_absoluto
+
+ORIGEN_PRECIOS = "precios_promedio"
+
+
+def etiqueta_producto(categoria, unidad_medida):
+    return f"{categoria} ({unidad_medida})"
+
+
+def construir_cubo(df):
+    """Arreglo ``valores[producto, region, mes]`` de ``precio_promedio`` con sus ejes."""
+    precios = df[(df["origen"] == ORIGEN_PRECIOS) & df["precio_promedio"].notna() & df["fecha"].notna()]
+    productos = pd.MultiIndex.from_frame(precios[["categoria", "unidad_medida"]].astype(object))
+    cod_producto, ejes_producto = pd.factorize(productos, sort=True)
+    cod_region, regiones = pd.factorize(precios["region"].astype(object), sort=True)
+
+    meses = precios["fecha"].to_numpy().astype("datetime64[M]").astype("int64")
+    mes0 = int(meses.min()) if len(meses) else 0
+    n_meses = int(meses.max()) - mes0 + 1 if len(meses) else 0
+
+    valores = np.full((len(ejes_producto), len(regiones), n_meses), np.nan)
+    valores[cod_producto, cod_region, meses - mes0] = precios["precio_promedio"].to_numpy(dtype="float64")
+
+    etiquetas = [etiqueta_producto(c, u) for c, u in ejes_producto]
+    return {
+        "valores": valores,
+        "productos": etiquetas,
+        "regiones": list(regiones),
+        "pos_producto": {p: i for i, p in enumerate(etiquetas)},
+        "pos_region": {r: i for i, r in enumerate(regiones)},
+        "mes0": mes0,
+    }
+
+
+def meses_cubo(cubo):
+    """Meses con algún precio, como texto ``%Y-%m`` en orden ascendente."""
+    con_datos = np.flatnonzero(~np.isnan(cubo["valores"]).all(axis=(0, 1)))
+    return (con_datos + cubo["mes0"]).astype("datetime64[M]").astype(str).tolist()
+
+
+def _posiciones(cubo, productos, regiones):
+    productos = cubo["productos"] if productos is None else productos
+    regiones = cubo["regiones"] if regiones is None else regiones
+    ip = np.array([cubo["pos_producto"][p] for p in productos], dtype=np.int64)
+    ir = np.array([cubo["pos_region"][r] for r in regiones], dtype=np.int64)
+    return list(productos), list(regiones), ip, ir
+
+
+def _columna_mes(cubo, fecha):
+    col = mes_absoluto(fecha) - cubo["mes0"]
+    if not 0 <= col < cubo["valores"].shape[2]:
+        raise KeyError(f"Mes fuera del rango de precios: {fecha}")
+    return col
+
+
+def serie_precios(cubo, productos, regiones, desde=None, hasta=None):
+    """Frame largo ``producto``, ``region``, ``fecha``, ``precio_promedio`` para graficar."""
+    productos, regiones, ip, ir = _posiciones(cubo, productos, regiones)
+    ini = 0 if desde is None else _columna_mes(cubo, desde)
+    fin = cubo["valores"].shape[2] - 1 if hasta is None else _columna_mes(cubo, hasta)
+    ini, fin = sorted([ini, fin])
+
+    corte = cubo["valores"][np.ix_(ip, ir, np.arange(ini, fin + 1))]
+    n_p, n_r, n_m = corte.shape
+    fechas = (np.arange(ini, fin + 1) + cubo["mes0"]).astype("datetime64[M]").astype("datetime64[ns]")
+    datos = pd.DataFrame({
+        "producto": np.repeat(productos, n_r * n_m),
+        "region": np.tile(np.repeat(regiones, n_m), n_p),
+        "fecha": np.tile(fechas, n_p * n_r),
+        "precio_promedio": corte.ravel(),
+    })
+    return datos.dropna(subset=["precio_promedio"])
+
+
+def variacion_precios(cubo, desde, hasta, productos=None, regiones=None):
+    """Frame largo con el precio en ``desde`` y ``hasta`` y su variación % por producto y región."""
+    productos, regiones, ip, ir = _posiciones(cubo, productos, regiones)
+    a = cubo["valores"][np.ix_(ip, ir, [_columna_mes(cubo, desde)])][:, :, 0]
+    b = cubo["valores"][np.ix_(ip, ir, [_columna_mes(cubo, hasta)])][:, :, 0]
+    return pd.DataFrame({
+        "producto": np.repeat(productos, len(regiones)),
+        "region": np.tile(regiones, len(productos)),
+        "precio_desde": a.ravel(),
+        "precio_hasta": b.ravel(),
+        "variacion_pct": ((b / a - 1) * 100).ravel(),
+    })
+
+
+def ranking_precios(cubo, desde, hasta, region, n=20):
+    """Los ``n`` productos con mayor aumento de precio en ``region`` entre dos meses."""
+    variaciones = variacion_precios(cubo, desde, hasta, regiones=[region]).dropna(subset=["variacion_pct"])
+    return variaciones.nlargest(n, "variacion_pct").reset_index(drop=True)
@@ -0,0 +1,151 @@
+"""Generación en lote de todos los gráficos región × categoría × indicador.
+
+    python -m ipc.reportes_lote --salida reportes --formato html --procesos 8
+
+Reutiliza la preparación de datos de ``series`` y las figuras de
+``graficos`` (las mismas que usa la app de Streamlit) con la selección
+de fechas por defecto: toda la historia disponible de cada serie. El
+trabajo se reparte en un pool de procesos; cada proceso carga el maestro
+una sola vez desde la caché en disco.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .datos import cargar_maestro, indexar_series, obtener_serie
+from .graficos import figura_acumulado, figura_serie_temporal
+from .series import (
+    INDICADORES,
+    SIN_OPCIONES,
+    calcular_acumulado,
+    datos_serie_temporal,
+    etiquetas_fechas,
+    fechas_hasta_interanual,
+    nombre_archivo,
+)
+
+FORMATOS = ["html", "json", "png", "svg"]
+
+# Estado por proceso, lo arma ``_iniciar_proceso``.
+_df = None
+_indice = None
+
+
+def _iniciar_proceso():
+    global _df, _indice
+    _df, _indice = indexar_series(cargar_maestro())
+
+
+def listar_trabajos(indice, origenes=None, regiones=None, categorias=None):
+    """Combinaciones (tipo, origen, región, categoría, columna) a graficar."""
+    trabajos = []
+    for origen, region, categoria in indice["series"]:
+        if origen not in INDICADORES:
+            continue
+        if origenes and origen not in origenes:
+            continue
+        if regiones and region not in regiones:
+            continue
+        if categorias and categoria not in categorias:
+            continue
+        for columna in INDICADORES[origen]:
+            trabajos.append(("Serie temporal", origen, region, categoria, columna))
+        trabajos.append(("Acumulado entre fechas", origen, region, categoria, "indice"))
+    return trabajos
+
+
+def construir_figura(df, indice, tipo, origen, region, categoria, columna):
+    """Figura de un trabajo con las fechas por defecto de la app, o ``None`` si no hay datos."""
+    base = obtener_serie(df, indice, origen, region, categoria).dropna(subset=[columna])
+    fechas_str_asc = etiquetas_fechas(base)
+    if not fechas_str_asc:
+        return None
+
+    if tipo == "Serie temporal":
+        desde_str = fechas_str_asc[0]
+        hasta_str = fechas_str_asc[-1]
+        if columna == "variacion_interanual":
+            fechas_hasta = fechas_hasta_interanual(fechas_str_asc, desde_str)
+            hasta_str = fechas_hasta[-1] if fechas_hasta else SIN_OPCIONES
+            if hasta_str == SIN_OPCIONES:
+                return None
+        datos = datos_serie_temporal(base, columna, desde_str, hasta_str)
+        if datos.empty:
+            return None
+        return figura_serie_temporal(datos, columna, categoria, region, origen)
+
+    acumulado = calcular_acumulado(base, fechas_str_asc[0], fechas_str_asc[-1])
+    if acumulado is None:
+        return None
+    return figura_acumulado(acumulado["datos"], categoria, region, origen)
+
+
+def _renderizar(args):
+    trabajo, salida, formato = args
+    tipo, origen, region, categoria, columna = trabajo
+    fig = construir_figura(_df, _indice, *trabajo)
+    if fig is None:
+        return trabajo, None
+
+    carpeta = os.path.join(salida, nombre_archivo(origen), nombre_archivo(region), nombre_archivo(categoria))
+    os.makedirs(carpeta, exist_ok=True)
+    prefijo = "serie_temporal" if tipo == "Serie temporal" else "acumulado"
+    ruta = os.path.join(carpeta, f"{prefijo}_{columna}.{formato}")
+    if formato == "html":
+        fig.write_html(ruta, include_plotlyjs="cdn", full_html=True)
+    elif formato == "json":
+        fig.write_json(ruta)
+    else:
+        fig.write_image(ruta)  # requiere kaleido
+    return trabajo, ruta
+
+
+def generar(salida, formato="html", procesos=None, origenes=None, regiones=None, categorias=None):
+    """Genera todos los gráficos en ``salida`` y devuelve un resumen de throughput."""
+    _iniciar_proceso()
+    trabajos = listar_trabajos(_indice, origenes, regiones, categorias)
+    tareas = [(t, salida, formato) for t in trabajos]
+    procesos = procesos or os.cpu_count() or 1
+
+    t0 = time.perf_counter()
+    if procesos == 1:
+        resultados = [_renderizar(t) for t in tareas]
+    else:
+        chunksize = max(1, len(tareas) // (procesos * 8))
+        with ProcessPoolExecutor(procesos, initializer=_iniciar_proceso) as pool:
+            resultados = list(pool.map(_renderizar, tareas, chunksize=chunksize))
+    segundos = time.perf_counter() - t0
+
+    escritos = [ruta for _, ruta in resultados if ruta]
+    return {
+        "trabajos": len(trabajos),
+        "graficos": len(escritos),
+        "sin_datos": len(trabajos) - len(escritos),
+        "procesos": procesos,
+        "segundos": segundos,
+        "graficos_por_segundo": len(escritos) / segundos if segundos else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta todos los gráficos del IPC sin abrir Streamlit.")
+    parser.add_argument("--salida", default="reportes")
+    parser.add_argument("--formato", choices=FORMATOS, default="html",
+                        help="png/svg requieren el paquete kaleido.")
+    parser.add_argument("--procesos", type=int, default=None, help="Por defecto, uno por CPU.")
+    parser.add_argument("--origen", action="append", dest="origenes")
+    parser.add_argument("--region", action="append", dest="regiones")
+    parser.add_argument("--categoria", action="append", dest="categorias")
+    args = parser.parse_args()
+
+    resumen = generar(args.salida, args.formato, args.procesos, args.origenes, args.regiones, args.categorias)
+    print(
+        f"{resumen['graficos']} gráficos en {resumen['segundos']:.1f} s "
+        f"con {resumen['procesos']} procesos: {resumen['graficos_por_segundo']:.1f} gráficos/s "
+        f"({resumen['sin_datos']} combinaciones sin datos)"
+    )
+
+
+if __name__ == "__main__":
+    main()
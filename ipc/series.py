@@ -0,0 +1,126 @@
+import re
+from bisect import bisect_right
+
+import numpy as np
+import pandas as pd
+
+# --- Indicadores graficables por origen ---
+INDICADORES = {
+    "variaciones": ["variacion_mensual", "variacion_interanual", "indice"],
+    "aperturas": ["indice"],
+}
+
+TIPOS_GRAFICO = ["Serie temporal", "Acumulado entre fechas"]
+
+SIN_OPCIONES = "(sin opciones disponibles)"
+
+
+def nombre_archivo(texto):
+    """``texto`` (región, categoría, ...) apto como nombre de archivo o carpeta."""
+    return re.sub(r"[^\w\-. ]+", "_", str(texto)).strip() or "_"
+
+
+def etiquetas_fechas(base):
+    """Meses presentes en ``base`` como texto ``%Y-%m``, en orden ascendente."""
+    fechas_disp = pd.to_datetime(sorted(base["fecha"].unique()))
+    return pd.Series(fechas_disp).dt.strftime("%Y-%m").tolist()
+
+
+def fechas_hasta_interanual(fechas_str_asc, desde_str):
+    """Meses "Hasta" válidos para la interanual: mismo mes, años posteriores."""
+    # ``%Y-%m`` ordena igual como texto que como fecha.
+    return [f for f in fechas_str_asc if f[5:7] == desde_str[5:7] and f > desde_str]
+
+
+def _ejes_meses(tabla):
+    """Meses de las columnas de ``tabla`` como texto ``%Y-%m`` y como mes del año (1-12)."""
+    meses = np.arange(tabla["mes0"], tabla["mes0"] + tabla["valores"].shape[1])
+    return meses.astype("datetime64[M]").astype(str).astype(object), (meses % 12) + 1
+
+
+def _metadatos(presentes, etiquetas, meses_del_anio):
+    por_mes = {}
+    for mes, etiqueta in zip(meses_del_anio[presentes].tolist(), etiquetas[presentes].tolist()):
+        por_mes.setdefault(mes, []).append(etiqueta)
+    fechas = etiquetas[presentes].tolist()
+    return {"fechas": fechas, "fechas_desc": fechas[::-1], "por_mes": por_mes}
+
+
+def metadatos_serie(tabla, clave):
+    """Meses con dato de la serie ``clave`` de una tabla de ``consultas``, listos para los selectores.
+
+    Devuelve ``{"fechas": [...], "fechas_desc": [...], "por_mes": {mes:
+    [...]}}`` con los meses como texto ``%Y-%m`` (ascendente y
+    descendente) y, en ``por_mes``, los mismos agrupados por mes del año
+    (1-12). Sólo recorre esa serie; si no está, las listas quedan vacías.
+    """
+    fila = tabla["filas"].get(clave)
+    if fila is None:
+        return {"fechas": [], "fechas_desc": [], "por_mes": {}}
+    etiquetas, meses_del_anio = _ejes_meses(tabla)
+    return _metadatos(~np.isnan(tabla["valores"][fila]), etiquetas, meses_del_anio)
+
+
+def hasta_interanual(metadatos, desde_str):
+    """``fechas_hasta_interanual`` sobre el resultado de ``metadatos_serie``, sin recorrer la serie."""
+    mismos = metadatos["por_mes"].get(int(desde_str[5:7]), [])
+    return mismos[bisect_right(mismos, desde_str):]
+
+
+def datos_serie_temporal(base, columna, desde_str, hasta_str):
+    """Tramo de ``base`` a graficar en la serie temporal.
+
+    Para ``variacion_interanual`` se toma sólo el mes de ``desde_str`` en
+    cada año hasta el de ``hasta_str``; para el resto, el rango de meses
+    (en cualquier orden).
+    """
+    desde_dt = pd.to_datetime(desde_str)
+    hasta_dt = pd.to_datetime(hasta_str)
+
+    if columna == "variacion_interanual":
+        datos = base[
+            (base["fecha"].dt.month == desde_dt.month) &
+            (base["fecha"].dt.year >= desde_dt.year) &
+            (base["fecha"].dt.year <= hasta_dt.year)
+        ]
+    else:
+        if hasta_dt < desde_dt:
+            desde_dt, hasta_dt = hasta_dt, desde_dt
+        datos = base[(base["fecha"] >= desde_dt) & (base["fecha"] <= hasta_dt)]
+    return datos.sort_values("fecha")
+
+
+def tramo_acumulado(base, desde_str, hasta_str, valor_a):
+    """Tramo de ``base`` entre dos meses con ``variacion_acum`` respecto de ``valor_a``."""
+    desde = pd.to_datetime(desde_str)
+    hasta = pd.to_datetime(hasta_str)
+    datos = base[(base["fecha"] >= desde) & (base["fecha"] <= hasta)].copy()
+    datos["variacion_acum"] = (datos["indice"] / valor_a - 1) * 100
+    return datos
+
+
+def calcular_acumulado(base, desde_str, hasta_str):
+    """Inflación acumulada del índice entre dos meses.
+
+    Devuelve ``None`` si falta el índice en alguno de los extremos; si no,
+    un dict con ``valor_a``, ``valor_b``, ``inflacion_acum`` y ``datos``
+    (el tramo con la columna ``variacion_acum`` respecto del inicio).
+    Para consultas repetidas conviene ``consultas.inflacion_acumulada``.
+    """
+    desde_str, hasta_str = sorted([desde_str, hasta_str])
+    desde = pd.to_datetime(desde_str)
+    hasta = pd.to_datetime(hasta_str)
+
+    indice_a = base.loc[base["fecha"] == desde, "indice"]
+    indice_b = base.loc[base["fecha"] == hasta, "indice"]
+    if indice_a.empty or indice_b.empty:
+        return None
+
+    valor_a = indice_a.iloc[0]
+    valor_b = indice_b.iloc[0]
+    return {
+        "valor_a": valor_a,
+        "valor_b": valor_b,
+        "inflacion_acum": (valor_b / valor_a - 1) * 100,
+        "datos": tramo_acumulado(base, desde_str, hasta_str, valor_a),
+    }
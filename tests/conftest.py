@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+
+# Los tests importan el paquete ``ipc`` desde la raíz del repo, como los benchmarks.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Las cachés en disco de los maestros de prueba no van a la del repo.
+os.environ.setdefault("IPC_CACHE_DIR", tempfile.mkdtemp(prefix="ipc_tests_"))
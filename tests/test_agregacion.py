@@ -0,0 +1,59 @@
+"""El cálculo vectorizado de "Región Nacional" contra el ``groupby().apply`` original."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from ipc.agregacion import REGION_NACIONAL, agregar_nacional, normalizar_pesos
+from ipc.datos import CSV_MAESTRO, leer_maestro
+from ipc.ponderaciones import pesos_regionales
+
+CLAVES = ["origen", "categoria", "fecha"]
+
+
+def nacional_original(df, pesos):
+    """Cálculo por grupo anterior a ``agregacion`` (el de ``benchmarks/bench_nacional.py``)."""
+    pesos = normalizar_pesos(pesos)
+    base = df[df["region"].isin(pesos.keys())].copy()
+    nacional = (
+        base.groupby(["fecha", "categoria", "origen"])
+        .apply(lambda g: sum(g["indice"] * g["region"].map(pesos)))
+        .reset_index(name="indice")
+        .sort_values("fecha")
+    )
+    nacional["variacion_mensual"] = nacional.groupby(["categoria", "origen"])["indice"].pct_change() * 100
+    nacional["variacion_interanual"] = nacional.groupby(["categoria", "origen"])["indice"].pct_change(12) * 100
+    return nacional
+
+
+def comparar(df, pesos):
+    esperado = nacional_original(df, pesos).sort_values(CLAVES, ignore_index=True)
+    completo = agregar_nacional(df, pesos)
+    obtenido = completo[completo["region"] == REGION_NACIONAL].sort_values(CLAVES, ignore_index=True)
+
+    assert len(completo) == len(df) + len(obtenido)
+    pd.testing.assert_frame_equal(obtenido[CLAVES], esperado[CLAVES], check_dtype=False)
+    for columna in ("indice", "variacion_mensual", "variacion_interanual"):
+        np.testing.assert_allclose(obtenido[columna].to_numpy(float), esperado[columna].to_numpy(float),
+                                   rtol=1e-9, equal_nan=True, err_msg=columna)
+
+
+def test_igual_al_original_en_el_maestro():
+    comparar(leer_maestro(CSV_MAESTRO), pesos_regionales())
+
+
+@pytest.mark.parametrize("caso", ["duplicada", "region_ausente", "indice_nulo"])
+def test_igual_al_original_en_casos_borde(caso):
+    pesos = {"GBA": 2.0, "Región Cuyo": 1.0, "Región Patagonia": 1.0}
+    fechas = pd.date_range("2020-01-01", periods=14, freq="MS")
+    df = pd.DataFrame([
+        {"categoria": c, "region": r, "fecha": f, "origen": "variaciones", "indice": 100.0 + i + j}
+        for i, f in enumerate(fechas)
+        for j, (c, r) in enumerate((c, r) for c in ("A", "B") for r in [*pesos, "Otra"])
+    ])
+    if caso == "duplicada":
+        df = pd.concat([df, df.iloc[[1]]], ignore_index=True)
+    elif caso == "region_ausente":
+        df = df.drop(index=df.index[(df["region"] == "GBA") & (df["fecha"] == fechas[5])])
+    else:
+        df.loc[(df["region"] == "Región Cuyo") & (df["fecha"] == fechas[7]), "indice"] = np.nan
+    comparar(df, pesos)
@@ -0,0 +1,41 @@
+"""Montos inválidos en ``/actualizar`` responden 400, no 500."""
+import json
+
+import pytest
+
+from ipc.almacen import preparar_datos
+from ipc.api import responder
+
+SERIE = {"region": "Región Nacional", "categoria": "Nivel general", "desde": "2020-01", "hasta": "2024-01"}
+
+
+@pytest.fixture(scope="module")
+def estado():
+    return {"datos": preparar_datos(origen="variaciones")}
+
+
+def actualizar(estado, **params):
+    consulta = {**SERIE, **params}
+    codigo, cuerpo = responder(estado, "/actualizar", consulta, f"test|{sorted(consulta.items())}")
+    return codigo, json.loads(cuerpo)
+
+
+@pytest.mark.parametrize("params", [
+    {"monto": "0", "monto_final": "100"},
+    {"monto": "-10", "monto_final": "100"},
+    {"monto": "nan", "monto_final": "100"},
+    {"monto": "inf"},
+    {"monto": "100", "monto_final": "nan"},
+    {"monto": "100", "monto_final": "-inf"},
+])
+def test_montos_invalidos(estado, params):
+    codigo, cuerpo = actualizar(estado, **params)
+    assert codigo == 400, cuerpo
+    assert "monto" in cuerpo["error"]
+
+
+def test_monto_valido(estado):
+    codigo, cuerpo = actualizar(estado, monto="100", monto_final="100")
+    assert codigo == 200, cuerpo
+    assert cuerpo["monto_actualizado"] > 100
+    assert cuerpo["diferencia_pct"] < 0
@@ -0,0 +1,35 @@
+"""Actualización masiva de montos: mismas reglas que la consulta individual."""
+import io
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from ipc.almacen import preparar_datos
+from ipc.consultas import actualizar_archivo
+
+ENTRADA = """region,categoria,desde,hasta,monto,monto_final
+Región Nacional,Nivel general,2020-01,2024-01,100,150
+Región Nacional,Nivel general,2020-01,2024-01,0,150
+Región Nacional,Nivel general,2020-01,2024-01,-5,150
+Región Nacional,Nivel general,2020-01,2024-01,,150
+Región Inexistente,Nivel general,2020-01,2024-01,100,150
+"""
+
+
+def test_montos_no_positivos_quedan_en_nan(tmp_path):
+    tabla = preparar_datos(origen="variaciones")[2]["indice"]
+    salida = tmp_path / "salida.csv"
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        resumen = actualizar_archivo(tabla, io.StringIO(ENTRADA), str(salida))
+
+    resultado = pd.read_csv(salida)
+    calculos = resultado[["monto_actualizado", "diferencia_pesos", "diferencia_pct"]].to_numpy()
+    assert not np.isinf(calculos).any()
+    assert np.isfinite(calculos[0]).all() and np.isnan(calculos[1:]).all()
+    assert resumen["filas"] == 5
+    assert resumen["sin_indice"] == 1
+    assert resumen["monto_invalido"] == 3
+    assert resumen["monto"] == 100
+    assert resumen["monto_actualizado"] == resultado.loc[0, "monto_actualizado"]
@@ -0,0 +1,41 @@
+"""La exportación sólo reemplaza exportaciones anteriores."""
+import os
+
+import pandas as pd
+import pytest
+
+from ipc.datos import CSV_MAESTRO
+from ipc.exportar import MANIFIESTO, exportar
+
+
+@pytest.fixture
+def maestro_chico(tmp_path):
+    """Dos categorías del maestro del repo, para exportar rápido."""
+    crudo = pd.read_csv(CSV_MAESTRO, dtype=str, keep_default_na=False)
+    ruta = tmp_path / "maestro.csv"
+    crudo[crudo["categoria"].isin(crudo["categoria"].unique()[:2])].to_csv(ruta, index=False)
+    return str(ruta)
+
+
+def test_no_pisa_un_directorio_ajeno(tmp_path, maestro_chico):
+    salida = tmp_path / "destino"
+    salida.mkdir()
+    (salida / "notas.txt").write_text("no borrar")
+
+    with pytest.raises(ValueError, match="no es una exportación anterior"):
+        exportar(str(salida), maestro_chico)
+    assert (salida / "notas.txt").read_text() == "no borrar"
+    assert sorted(os.listdir(tmp_path)) == ["destino", "maestro.csv"]
+
+
+def test_reemplaza_una_exportacion_anterior(tmp_path, maestro_chico):
+    salida = tmp_path / "destino"
+    salida.mkdir()
+
+    manifiesto, escrita = exportar(str(salida), maestro_chico)
+    assert escrita and (salida / MANIFIESTO).exists()
+    assert exportar(str(salida), maestro_chico) == (manifiesto, False)
+
+    manifiesto, escrita = exportar(str(salida), maestro_chico, forzar=True)
+    assert escrita and manifiesto["series"] > 0
+    assert sorted(os.listdir(tmp_path)) == ["destino", "maestro.csv"]
@@ -0,0 +1,43 @@
+"""Anexar el último mes con la ingesta da el mismo maestro que recargarlo entero."""
+import pandas as pd
+import pytest
+
+from ipc.datos import CSV_MAESTRO, cargar_maestro, leer_maestro
+from ipc.ingesta import anexar_delta, ingerir
+
+CLAVES = ["origen", "region", "categoria", "fecha"]
+
+
+def ordenado(df):
+    return df.sort_values(CLAVES, ignore_index=True)
+
+
+@pytest.fixture
+def maestro_partido(tmp_path):
+    """``(maestro sin el último mes, delta con ese mes, dir_cache)`` como CSV en ``tmp_path``."""
+    crudo = pd.read_csv(CSV_MAESTRO, dtype=str, keep_default_na=False)
+    ultimo = crudo["fecha"].str[:7].max()
+    es_ultimo = crudo["fecha"].str[:7] == ultimo
+    ruta_maestro, ruta_delta = tmp_path / "maestro.csv", tmp_path / "delta.csv"
+    crudo[~es_ultimo].to_csv(ruta_maestro, index=False)
+    crudo[es_ultimo].to_csv(ruta_delta, index=False)
+    return str(ruta_maestro), str(ruta_delta), str(tmp_path / "cache")
+
+
+def test_anexar_delta_igual_a_recargar(maestro_partido):
+    ruta_maestro, ruta_delta, dir_cache = maestro_partido
+    maestro = cargar_maestro(ruta_maestro, dir_cache=dir_cache)
+    actualizado = anexar_delta(maestro, leer_maestro(ruta_delta))
+
+    esperado = cargar_maestro(CSV_MAESTRO, usar_cache=False)
+    pd.testing.assert_frame_equal(ordenado(actualizado), ordenado(esperado), check_exact=False, rtol=1e-9)
+
+
+def test_ingerir_escribe_csv_y_cache(maestro_partido):
+    ruta_maestro, ruta_delta, dir_cache = maestro_partido
+    actualizado, _, _ = ingerir(ruta_delta, ruta_maestro, dir_cache=dir_cache)
+
+    recargado = cargar_maestro(ruta_maestro, usar_cache=False)
+    pd.testing.assert_frame_equal(ordenado(actualizado), ordenado(recargado), check_exact=False, rtol=1e-9)
+    # La caché escrita por la ingesta es la que se lee en la próxima carga.
+    pd.testing.assert_frame_equal(cargar_maestro(ruta_maestro, dir_cache=dir_cache), actualizado)